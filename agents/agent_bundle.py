@@ -0,0 +1,83 @@
+"""
+Agent Bundle
+Role: Produce the tailored CV and the cover letter in a single LLM round trip.
+"""
+
+import json
+from typing import Dict, Any, List
+from utils.deepseek_client import DeepSeekClient
+from agents.cv_customizer import CVCustomizer
+from agents.cover_letter_generator import CoverLetterGenerator
+
+class AgentBundle:
+    """
+    Agent that fuses CV customization and cover letter writing into one request,
+    so the shared profile + job analysis context is only sent (and billed) once.
+    """
+
+    def __init__(self, client: DeepSeekClient):
+        self.client = client
+        self.cv_customizer = CVCustomizer(client)
+        self.cover_letter_generator = CoverLetterGenerator(client)
+        self.system_instruction = f"""
+        ## SECTION: CV
+        {self.cv_customizer.system_instruction}
+        ## SECTION: COVER LETTER
+        {self.cover_letter_generator.system_instruction}
+        Return raw JSON only.
+        """
+
+    def generate_all(self, profile: Dict[str, Any], job_analysis: Dict[str, Any], relevant_snippets: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Generate the customized CV and the cover letter with one LLM call.
+
+        Args:
+            profile: Candidate's master profile
+            job_analysis: Structured analysis of the target job
+            relevant_snippets: (Optional) High-relevance snippets retrieved via RAG
+
+        Returns:
+            Dictionary with "cv" (customized profile) and "cover_letter" (letter body text)
+        """
+        print("🧩 Customizing CV and writing cover letter in one pass...")
+
+        rag_context = ""
+        if relevant_snippets:
+            rag_context = "\nPRIORITY CONTEXT (Top Relevant Experience):\n" + json.dumps(relevant_snippets, indent=2)
+
+        prompt = f"""
+        Tailor this candidate's CV and write a cover letter for the same job application.
+
+        ## SECTION: CV
+        {self.cv_customizer.task_instruction}
+
+        ## SECTION: COVER LETTER
+        {self.cover_letter_generator.task_instruction}
+
+        FINAL OUTPUT FORMAT (JSON):
+        {{
+            "cv": {{ ...the customized CV object described in the CV section... }},
+            "cover_letter": "The cover letter body as plain text, paragraphs separated by newlines"
+        }}
+
+        CANDIDATE BASE PROFILE:
+        {json.dumps(profile, indent=2)}
+        {rag_context}
+
+        JOB ANALYSIS:
+        {json.dumps(job_analysis, indent=2)}
+        """
+
+        # Temperature 0.6 sits between the CV (0.5) and cover letter (0.7) settings
+        result = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.6, ensure_json_hint=False)
+
+        cv = result.get("cv")
+        cover_letter = result.get("cover_letter")
+        if not isinstance(cv, dict) or not isinstance(cover_letter, str) or not cover_letter.strip():
+            # Fall back to the single-shot agents if the fused output is incomplete
+            print("⚠️  Bundled output incomplete. Falling back to separate calls...")
+            cv = cv if isinstance(cv, dict) else self.cv_customizer.customize(profile, job_analysis, relevant_snippets)
+            if not isinstance(cover_letter, str) or not cover_letter.strip():
+                cover_letter = self.cover_letter_generator.generate(profile, job_analysis)
+
+        return {"cv": cv, "cover_letter": cover_letter}
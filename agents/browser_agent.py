@@ -5,19 +5,88 @@ Role: Navigate the web, find job postings, and interact with job boards autonomo
 
 import os
 import asyncio
-from typing import Dict, Any, List, Optional
-from playwright.async_api import async_playwright, Page, Browser
+from typing import List, Optional
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from utils.deepseek_client import DeepSeekClient
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# The agent only reads DOM text and interactive elements, so these are pure download overhead
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Installed once per context: lists interactive elements (first 50) as ready-to-prompt text lines
+PAGE_SUMMARY_INIT_JS = '''window.__getSummary = () => {
+    const items = Array.from(document.querySelectorAll('a, button, input, h1, h2, [role="button"]'));
+    return items
+        .map(el => ({ tag: el.tagName, text: (el.innerText || '').substring(0, 50).trim(), id: el.id }))
+        .filter(item => item.text || item.id)
+        .slice(0, 50)
+        .map((item, i) => `[${i}] ${item.tag} - '${item.text}' (Select via: ${item.tag.toLowerCase()}:has-text('${item.text}'))`)
+        .join('\\n');
+};'''
+
+# Cheap "has the page changed?" probe used to skip re-summarizing an unchanged DOM
+PAGE_FINGERPRINT_JS = "() => [location.href, document.body ? document.body.innerText.length : 0]"
+
+async def _block_heavy_resources(route):
+    """Abort requests for assets the page summary never looks at."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class BrowserPool:
+    """
+    A pool of pre-warmed Chromium browser contexts shared across BrowserAgent sessions.
+    Launching Chromium is the dominant cost of a cold navigation, so it is paid once at startup.
+    """
+
+    def __init__(self, size: int = 2):
+        self.size = size
+        self.playwright = None
+        self.browsers: List[Browser] = []
+        self.contexts: asyncio.Queue = asyncio.Queue()
+
+    async def start(self):
+        """Launch the browsers and fill the pool with ready contexts."""
+        self.playwright = await async_playwright().start()
+        for _ in range(self.size):
+            browser = await self.playwright.chromium.launch(headless=True)
+            context = await browser.new_context(user_agent=USER_AGENT)
+            # Note: routing disables the HTTP cache for this context; the agent rarely revisits pages
+            await context.route("**/*", _block_heavy_resources)
+            await context.add_init_script(PAGE_SUMMARY_INIT_JS)
+            self.browsers.append(browser)
+            self.contexts.put_nowait(context)
+
+    async def get(self) -> BrowserContext:
+        """Borrow a context, waiting if all of them are in use."""
+        return await self.contexts.get()
+
+    def put(self, context: BrowserContext):
+        """Return a borrowed context to the pool."""
+        self.contexts.put_nowait(context)
+
+    async def stop(self):
+        """Close all browsers in the pool."""
+        for browser in self.browsers:
+            await browser.close()
+        self.browsers = []
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
 class BrowserAgent:
     """
     An agent capable of autonomous web navigation using Playwright and DeepSeek.
     """
 
-    def __init__(self, client: DeepSeekClient):
+    def __init__(self, client: DeepSeekClient, pool: Optional[BrowserPool] = None):
         self.client = client
-        self.browser: Optional[Browser] = None
-        self.context: Any = None
+        # A shared pool is owned (started/stopped) by the caller; otherwise start() creates a private one
+        self.pool = pool
+        self._owns_pool = pool is None
         self.system_instruction = """
         You are an Autonomous Browser Agent. Your goal is to navigate websites based on user instructions.
         You can see a simplified version of the page content.
@@ -33,98 +102,103 @@ class BrowserAgent:
         """
 
     async def start(self):
-        """Initialize browser session."""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
-        self.context = await self.browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        """Initialize browser session (no-op when using a shared pool)."""
+        if self._owns_pool:
+            self.pool = BrowserPool(size=1)
+            await self.pool.start()
 
     async def stop(self):
-        """Close browser session."""
-        if self.browser:
-            await self.browser.close()
-        if hasattr(self, 'playwright'):
-            await self.playwright.stop()
+        """Close browser session (shared pools are left running)."""
+        if self._owns_pool and self.pool:
+            await self.pool.stop()
 
     async def _get_page_summary(self, page: Page) -> str:
         """Extract a simplified version of the page for the LLM."""
-        # Get all interactive elements
-        elements = await page.evaluate('''() => {
-            const items = Array.from(document.querySelectorAll('a, button, input, h1, h2, [role="button"]'));
-            return items.map(el => ({
-                tag: el.tagName,
-                text: el.innerText.substring(0, 50).trim(),
-                id: el.id,
-                className: el.className,
-                type: el.type
-            })).filter(item => item.text || item.id);
-        }''')
-        
-        summary = f"URL: {page.url}\nContent Summary:\n"
-        for i, el in enumerate(elements[:50]): # Limit to first 50 elements
-            summary += f"[{i}] {el['tag']} - '{el['text']}' (Select via: {el['tag'].lower()}:has-text('{el['text']}'))\n"
-        
-        return summary
+        # The summarizer is pre-installed via add_init_script; formatting happens in the browser
+        # so only one string crosses the CDP boundary
+        return f"URL: {page.url}\nContent Summary:\n" + await page.evaluate("() => window.__getSummary()")
 
     async def navigate_and_extract(self, url: str, goal: str) -> str:
         """Navigate to a URL and attempt to achieve a goal autonomously."""
-        page = await self.context.new_page()
-        await page.goto(url)
-        
-        history = []
-        for step in range(5): # Limit to 5 steps for safety
-            summary = await self._get_page_summary(page)
-            
-            prompt = f"""
-            GOAL: {goal}
-            CURRENT PAGE STATE:
-            {summary}
-            
-            PREVIOUS ACTIONS:
-            {history}
-            
-            What is your next action?
-            """
-            
-            response = self.client.generate_json(prompt, system_instruction=self.system_instruction)
-            action = response.get("action")
-            
-            print(f"🤖 Browser Agent Step {step+1}: {action}...")
-            history.append(response)
-            
-            if action == "NAVIGATE":
-                await page.goto(response.get("url"))
-            elif action == "CLICK":
-                await page.click(response.get("selector"))
-                await page.wait_for_load_state("networkidle")
-            elif action == "TYPE":
-                await page.fill(response.get("selector"), response.get("text"))
-            elif action == "EXTRACT":
-                content = await page.content()
-                history.append({"extracted": "Content captured"})
-            elif action == "FINISH":
-                return response.get("summary", "Goal achieved.")
-            
-            await asyncio.sleep(2) # Human-like delay
-            
-        await page.close()
-        return "Task timed out."
-
-async def main_test():
-    # Quick test if run directly
-    from utils.deepseek_client import DeepSeekClient
-    from dotenv import load_dotenv
-    load_dotenv()
-    
-    api_key = os.getenv("DEEPSEEK_API_KEY")
-    client = DeepSeekClient(api_key=api_key)
-    agent = BrowserAgent(client)
+        context = await self.pool.get()
+        page = await context.new_page()
+        try:
+            await page.goto(url)
+
+            history = []
+            goal_words = set(goal.lower().split())
+            last_fingerprint, last_summary = None, None
+            for step in range(5): # Limit to 5 steps for safety
+                fingerprint = await page.evaluate(PAGE_FINGERPRINT_JS)
+                if fingerprint == last_fingerprint:
+                    summary = last_summary
+                else:
+                    summary = await self._get_page_summary(page)
+                    last_fingerprint, last_summary = fingerprint, summary
+
+                prompt = f"""
+                GOAL: {goal}
+                CURRENT PAGE STATE:
+                {summary}
+
+                PREVIOUS ACTIONS:
+                {history}
+
+                What is your next action?
+                """
+
+                response = self.client.generate_json(prompt, system_instruction=self.system_instruction)
+                action = response.get("action")
+
+                print(f"🤖 Browser Agent Step {step+1}: {action}...")
+                history.append(response)
+
+                if action == "NAVIGATE":
+                    await page.goto(response.get("url"))
+                elif action == "CLICK":
+                    await page.click(response.get("selector"))
+                    try:
+                        # Bounded wait: DOM is enough for the summary, analytics traffic is not
+                        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+                    except PlaywrightTimeoutError:
+                        pass
+                elif action == "TYPE":
+                    await page.fill(response.get("selector"), response.get("text"))
+                    await page.wait_for_timeout(200) # Let XHR-driven suggest boxes settle
+                elif action == "EXTRACT":
+                    # Visible text only (not the full HTML), fed back so the next step can use it
+                    content = await page.evaluate("() => document.body ? document.body.innerText.slice(0, 4000) : ''")
+                    history.append({"extracted": content})
+
+                    # Cheap goal check (no LLM call): stop as soon as the extract looks like an answer
+                    overlap = len(goal_words & set(content.lower().split()))
+                    if overlap >= 3 or len(content) > 200:
+                        return content
+                elif action == "FINISH":
+                    return response.get("summary", "Goal achieved.")
+
+            return "Task timed out."
+        finally:
+            # Only the page is closed; the warm context goes back to the pool
+            await page.close()
+            self.pool.put(context)
+
+async def main_test(client: Optional[DeepSeekClient] = None):
+    # Quick test if run directly; reuse the caller's client (and its connection pool) when given
+    if client is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+        client = DeepSeekClient(api_key=os.getenv("DEEPSEEK_API_KEY"))
+
+    pool = BrowserPool(size=1)
+    await pool.start()
+    agent = BrowserAgent(client, pool=pool)
     
-    await agent.start()
-    result = await agent.navigate_and_extract("https://news.ycombinator.com", "Find the title of the first post.")
-    print(f"RESULT: {result}")
-    await agent.stop()
+    try:
+        result = await agent.navigate_and_extract("https://news.ycombinator.com", "Find the title of the first post.")
+        print(f"RESULT: {result}")
+    finally:
+        await pool.stop()
 
 if __name__ == "__main__":
     asyncio.run(main_test())
@@ -20,6 +20,20 @@ class CoverLetterGenerator:
         You avoid generic clichés (e.g., "I am writing to apply...").
         You use a professional yet enthusiastic tone.
         """
+        self.task_instruction = """
+        STRUCTURE:
+        Paragraph 1 (Opening): Strong hook + excitement about the specific role/company.
+        Paragraph 2 (The Match): Why this company? Connect their mission/needs to candidate's background.
+        Paragraph 3 (The Proof): Highlight the most relevant achievement from the profile that solves a key problem they have.
+        Paragraph 4 (Closing): Call to action, availability, and professional sign-off.
+
+        CRITICAL RULES:
+        1. Tone: Professional, confident, but grounded (not arrogant).
+        2. Length: 250-350 words.
+        3. Do NOT include placeholder addresses (header will be handled separately). Just the body.
+        4. Use specific keywords from the job analysis.
+        5. "Show, don't just tell" - use metrics from the profile.
+        """
 
     def generate(self, profile: Dict[str, Any], job_analysis: Dict[str, Any]) -> str:
         """
@@ -37,24 +51,13 @@ class CoverLetterGenerator:
         prompt = f"""
         Create a compelling cover letter for this job application.
 
+        {self.task_instruction}
+
         CANDIDATE PROFILE:
         {json.dumps(profile, indent=2)}
 
         JOB ANALYSIS:
         {json.dumps(job_analysis, indent=2)}
-
-        STRUCTURE:
-        Paragraph 1 (Opening): Strong hook + excitement about the specific role/company.
-        Paragraph 2 (The Match): Why this company? Connect their mission/needs to candidate's background.
-        Paragraph 3 (The Proof): Highlight the most relevant achievement from the profile that solves a key problem they have.
-        Paragraph 4 (Closing): Call to action, availability, and professional sign-off.
-
-        CRITICAL RULES:
-        1. Tone: Professional, confident, but grounded (not arrogant).
-        2. Length: 250-350 words.
-        3. Do NOT include placeholder addresses (header will be handled separately). Just the body.
-        4. Use specific keywords from the job analysis.
-        5. "Show, don't just tell" - use metrics from the profile.
         """
 
         # Temperature 0.7 for creativity/personality
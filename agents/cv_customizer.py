@@ -21,36 +21,7 @@ class CVCustomizer:
         You ensure high ATS compliance by naturally integrating keywords.
         Return raw JSON only.
         """
-
-    def customize(self, profile: Dict[str, Any], job_analysis: Dict[str, Any], relevant_snippets: List[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """
-        Customize the candidate profile for the analyzed job.
-        
-        Args:
-            profile: Candidates base profile
-            job_analysis: Structured analysis of the target job
-            relevant_snippets: (Optional) High-relevance snippets retrieved via RAG
-            
-        Returns:
-            Customized profile dictionary ready for document generation
-        """
-        print("🎨 Customizing candidate profile using RAG contexts...")
-        
-        # Format snippets for prompt
-        rag_context = ""
-        if relevant_snippets:
-            rag_context = "\nPRIORITY CONTEXT (Top Relevant Experience):\n" + json.dumps(relevant_snippets, indent=2)
-
-        prompt = f"""
-        Tailor this candidate's profile to match the job requirements perfectly.
-        {rag_context}
-
-        CANDIDATE BASE PROFILE:
-        {json.dumps(profile, indent=2)}
-
-        JOB ANALYSIS:
-        {json.dumps(job_analysis, indent=2)}
-
+        self.task_instruction = """
         TASK:
         1. Rewrite the "Professional Summary" to highlight relevant experience for THIS job.
         2. Reorder and filter "Core Skills" to prioritize the job's "must_have_skills".
@@ -61,15 +32,15 @@ class CVCustomizer:
            - Use STAR method (Situation, Task, Action, Result) where possible
         
         OUTPUT FORMAT (JSON):
-        {{
-            "personal_info": {{ ...keep original... }},
+        {
+            "personal_info": { ...keep original... },
             "summary": "Tailored summary...",
-            "skills": {{
+            "skills": {
                 "Technical": ["..."],
                 "Soft Skills": ["..."]
-            }},
+            },
             "experience": [
-                {{
+                {
                     "company": "...",
                     "title": "...",
                     "dates": "...",
@@ -77,10 +48,10 @@ class CVCustomizer:
                         "Optimized bullet point 1...",
                         "Optimized bullet point 2..."
                     ]
-                }}
+                }
             ],
             "education": [ ...keep original... ]
-        }}
+        }
 
         CRITICAL RULES:
         1. Do NOT invent experiences. Only reframe existing ones.
@@ -89,5 +60,37 @@ class CVCustomizer:
         4. Maintain a professional, executive tone.
         """
 
+    def customize(self, profile: Dict[str, Any], job_analysis: Dict[str, Any], relevant_snippets: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Customize the candidate profile for the analyzed job.
+        
+        Args:
+            profile: Candidates base profile
+            job_analysis: Structured analysis of the target job
+            relevant_snippets: (Optional) High-relevance snippets retrieved via RAG
+            
+        Returns:
+            Customized profile dictionary ready for document generation
+        """
+        print("🎨 Customizing candidate profile using RAG contexts...")
+        
+        # Format snippets for prompt
+        rag_context = ""
+        if relevant_snippets:
+            rag_context = "\nPRIORITY CONTEXT (Top Relevant Experience):\n" + json.dumps(relevant_snippets, indent=2)
+
+        prompt = f"""
+        Tailor this candidate's profile to match the job requirements perfectly.
+
+        {self.task_instruction}
+
+        CANDIDATE BASE PROFILE:
+        {json.dumps(profile, indent=2)}
+        {rag_context}
+
+        JOB ANALYSIS:
+        {json.dumps(job_analysis, indent=2)}
+        """
+
         # Temperature 0.5 for a balance of creativity and adherence to facts
-        return self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.5)
+        return self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.5, ensure_json_hint=False)
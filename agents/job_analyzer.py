@@ -3,16 +3,70 @@ Job Analyzer Agent
 Role: Analyze job descriptions to extract requirements, skills, and keywords.
 """
 
+import re
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, List
 from utils.deepseek_client import DeepSeekClient
 
+# Careers-page chrome that carries no information about the role
+_NAV_LINES = {
+    "home", "careers", "jobs", "sign in", "log in", "login", "sign up", "register", "menu",
+    "search", "search jobs", "apply", "apply now", "save", "save job", "share", "back",
+    "privacy policy", "terms of use", "cookie settings", "accept cookies", "skip to content",
+}
+_INLINE_WS_RE = re.compile(r'[ \t\u00a0]+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+# Lines worth keeping from the middle of an over-long posting
+_SKILL_LINE_RE = re.compile(
+    r'^\s*[-•*·]|\b(?:experience|skills?|requirements?|qualifications?|proficien\w*|knowledge|degree|years)\b',
+    re.IGNORECASE
+)
+
+def description_hash(job_description: str) -> bytes:
+    """Identity of a job description, used as the analysis cache key (and by callers caching per job)."""
+    return hashlib.blake2b(job_description.encode("utf-8")).digest()
+
+def _condense(text: str, max_chars: int = 8000) -> str:
+    """
+    Shrink an over-long job description before it is sent to the LLM.
+
+    Collapses whitespace and drops navigation-only lines; if still too long, keeps the
+    head and tail of the posting plus requirement-looking lines from the middle.
+    """
+    if len(text) <= max_chars:
+        return text
+
+    text = _BLANK_LINES_RE.sub('\n\n', _INLINE_WS_RE.sub(' ', text))
+    text = '\n'.join(line for line in text.split('\n') if line.strip().lower() not in _NAV_LINES)
+    if len(text) <= max_chars:
+        return text
+
+    head_len = max_chars * 6 // 10
+    tail_len = max_chars * 2 // 10
+    middle_budget = max_chars - head_len - tail_len
+
+    middle = []
+    for line in text[head_len:len(text) - tail_len].split('\n'):
+        if _SKILL_LINE_RE.search(line) and len(line) <= middle_budget:
+            middle.append(line.strip())
+            middle_budget -= len(line) + 1
+
+    return text[:head_len] + '\n...\n' + '\n'.join(middle) + '\n...\n' + text[-tail_len:]
+
 class JobAnalyzer:
     """
     Agent responsible for breaking down job descriptions into structured data.
     """
     
-    def __init__(self, client: DeepSeekClient):
+    def __init__(self, client: DeepSeekClient, cache_size: int = 512):
         self.client = client
+        # LRU of raw LLM output (JSON string) keyed by job description hash
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.system_instruction = """
         You are an expert Recruitment Analyst with 20 years of experience in Talent Acquisition.
         Your role is to deconstruct job descriptions to understand exactly what the employer is looking for.
@@ -22,6 +76,36 @@ class JobAnalyzer:
         mentioned in the text, return exactly "Unknown" for that field. Do NOT guess or hallucinate.
         Return raw JSON only.
         """
+        self.task_instruction = """
+        Extract and return a JSON object with this EXACT structure:
+        {
+          "role_info": {
+            "title": "Job Title",
+            "company": "Company Name (if found)",
+            "location": "Location (if found)",
+            "level": "Junior/Mid/Senior/Lead"
+          },
+          "requirements": {
+            "must_have_skills": ["Skill 1", "Skill 2"],
+            "nice_to_have_skills": ["Skill 3", "Skill 4"],
+            "education": "Required Degree/Certifications",
+            "years_experience": "X years"
+          },
+          "keywords": {
+            "ats_keywords": ["Keyword1", "Keyword2"],
+            "soft_skills": ["Soft Skill 1"]
+          },
+          "summary": "Brief 2-sentence summary of the role"
+        }
+
+        CRITICAL RULES:
+        1. Extract information EXACTLY as stated in job description
+        2. Use EXACT keywords for ATS optimization (preserve capitalization, e.g. "Python" not "python")
+        3. Prioritize skills based on emphasis in posting
+        4. If information not provided, use null or empty array
+        5. Be objective - don't make assumptions
+        6. Return ONLY valid JSON
+        """
 
     def _validate_analysis(self, analysis: Dict[str, Any], raw_text: str) -> Dict[str, Any]:
         """
@@ -35,24 +119,30 @@ class JobAnalyzer:
             Validated analysis dictionary
         """
         role_info = analysis.get("role_info", {})
+        # Lowercase the (possibly large) description once for all checks
+        raw_text_lc = raw_text.lower()
         
-        # Check for Company Name hallucination
-        company = role_info.get("company", "Unknown")
-        if company and company != "Unknown":
-            # If the company name isn't found in the raw text (case-insensitive check)
-            if company.lower() not in raw_text.lower():
-                print(f"⚠️  Validation: Detected potential hallucination for company '{company}'. Resetting to 'Unknown'.")
-                role_info["company"] = "Unknown"
+        # Check for hallucinated facts: each value must appear in the raw text (case-insensitive)
+        for field in ("company", "location", "title"):
+            value = role_info.get(field)
+            if isinstance(value, str) and value and value != "Unknown" and value.lower() not in raw_text_lc:
+                print(f"⚠️  Validation: Detected potential hallucination for {field} '{value}'. Resetting to 'Unknown'.")
+                role_info[field] = "Unknown"
         
-        # Ensure lists are actually lists
-        if not isinstance(analysis.get("keywords", {}).get("ats_keywords"), list):
-            analysis["keywords"]["ats_keywords"] = []
+        # Ensure lists are actually lists (the "keywords" block itself may be missing or malformed)
+        keywords = analysis.get("keywords")
+        if not isinstance(keywords, dict):
+            keywords = analysis["keywords"] = {}
+        for field in ("ats_keywords", "soft_skills"):
+            if not isinstance(keywords.get(field), list):
+                keywords[field] = []
             
         return analysis
 
     def analyze(self, job_description: str) -> Dict[str, Any]:
         """
         Analyze a job description string.
+        Repeated descriptions (retries, regenerations) are served from an in-memory LRU cache.
 
         Args:
             job_description: The full text of the job posting
@@ -60,46 +150,112 @@ class JobAnalyzer:
         Returns:
             Structured dictionary containing role info, requirements, and keywords.
         """
+        desc_hash = description_hash(job_description)
+        cached = self._cache_get(desc_hash)
+
+        if cached is not None:
+            print(f"⚡ Using cached analysis for job description ({len(job_description)} chars)")
+        else:
+            cached = self._cache_put(desc_hash, self._run_analysis(job_description))
+
+        # Validation mutates the dict, so always work on a fresh copy
+        return self._validate_analysis(json.loads(cached), job_description)
+
+    def analyze_batch(self, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze several job descriptions with a single LLM call.
+
+        Cached descriptions are answered from the LRU; the rest share one prompt that asks
+        for one analysis per input. Any entry missing from the batched reply is retried
+        through analyze().
+
+        Args:
+            job_descriptions: Full texts of the job postings
+
+        Returns:
+            One structured analysis per input, in input order.
+        """
+        hashes = [description_hash(jd) for jd in job_descriptions]
+        raw = [self._cache_get(desc_hash) for desc_hash in hashes]
+        pending = [i for i, cached in enumerate(raw) if cached is None]
+
+        if len(pending) > 1:
+            analyses = self._run_batch_analysis([job_descriptions[i] for i in pending])
+            for i, analysis in zip(pending, analyses):
+                if isinstance(analysis, dict) and analysis.get("role_info"):
+                    raw[i] = self._cache_put(hashes[i], analysis)
+
+        return [
+            self._validate_analysis(json.loads(cached), jd) if cached is not None else self.analyze(jd)
+            for jd, cached in zip(job_descriptions, raw)
+        ]
+
+    def _cache_get(self, desc_hash: bytes):
+        """Return the cached raw analysis (JSON string) for a description hash, or None."""
+        with self._cache_lock:
+            cached = self._cache.get(desc_hash)
+            if cached is not None:
+                self._cache.move_to_end(desc_hash)
+        return cached
+
+    def _cache_put(self, desc_hash: bytes, analysis: Dict[str, Any]) -> str:
+        """Store a raw analysis in the LRU and return its serialized form."""
+        serialized = json.dumps(analysis)
+        with self._cache_lock:
+            self._cache[desc_hash] = serialized
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return serialized
+
+    def _run_analysis(self, job_description: str) -> Dict[str, Any]:
+        """Call the LLM to analyze a job description (uncached)."""
         print(f"🔍 Analyzing job description ({len(job_description)} chars)...")
+        condensed = _condense(job_description)
+        if len(condensed) < len(job_description):
+            print(f"✂️  Condensed job description: {len(job_description)} -> {len(condensed)} chars")
 
+        # Static instructions first, job description last: keeps a stable prefix for
+        # DeepSeek's server-side prompt cache
         prompt = f"""
-        Analyze this job description and extract comprehensive information:
+        Analyze the job description below and extract comprehensive information.
+
+        {self.task_instruction}
 
         JOB DESCRIPTION:
-        {job_description}
+        {condensed}
+        """
 
-        Extract and return a JSON object with this EXACT structure:
+        # Greedy decoding (temperature 0) for deterministic, cacheable structured extraction
+        return self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0, ensure_json_hint=False)
+
+    def _run_batch_analysis(self, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """Call the LLM once for several job descriptions (uncached)."""
+        print(f"🔍 Analyzing {len(job_descriptions)} job descriptions in one batch...")
+        blocks = "\n\n".join(
+            f"JOB DESCRIPTION #{i}:\n{_condense(jd)}" for i, jd in enumerate(job_descriptions, 1)
+        )
+
+        prompt = f"""
+        Analyze each of the {len(job_descriptions)} job descriptions below independently and extract
+        comprehensive information for each one.
+
+        {self.task_instruction}
+
+        BATCH OUTPUT FORMAT (JSON):
         {{
-          "role_info": {{
-            "title": "Job Title",
-            "company": "Company Name (if found)",
-            "location": "Location (if found)",
-            "level": "Junior/Mid/Senior/Lead"
-          }},
-          "requirements": {{
-            "must_have_skills": ["Skill 1", "Skill 2"],
-            "nice_to_have_skills": ["Skill 3", "Skill 4"],
-            "education": "Required Degree/Certifications",
-            "years_experience": "X years"
-          }},
-          "keywords": {{
-            "ats_keywords": ["Keyword1", "Keyword2"],
-            "soft_skills": ["Soft Skill 1"]
-          }},
-          "summary": "Brief 2-sentence summary of the role"
+          "analyses": [ one object with the structure above per job description, in input order ]
         }}
+        Return exactly {len(job_descriptions)} analyses.
 
-        CRITICAL RULES:
-        1. Extract information EXACTLY as stated in job description
-        2. Use EXACT keywords for ATS optimization (preserve capitalization, e.g. "Python" not "python")
-        3. Prioritize skills based on emphasis in posting
-        4. If information not provided, use null or empty array
-        5. Be objective - don't make assumptions
-        6. Return ONLY valid JSON
+        {blocks}
         """
 
-        # Temperature 0.1 for structured extraction
-        result = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.1)
-        
-        # Apply validation layer
-        return self._validate_analysis(result, job_description)
+        result = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0, ensure_json_hint=False)
+        analyses = result.get("analyses") if isinstance(result, dict) else None
+        if not isinstance(analyses, list):
+            print("⚠️  Batched analysis returned no 'analyses' array.")
+            return []
+        if len(analyses) != len(job_descriptions):
+            print(f"⚠️  Batched analysis returned {len(analyses)} results for {len(job_descriptions)} inputs.")
+            return []
+        return analyses
@@ -4,22 +4,31 @@ Role: Expose the agentic workflow as a scalable API with file downloads.
 """
 
 import os
+import re
 import uuid
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
+from urllib.parse import quote
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
 from dotenv import load_dotenv
 
 # Import components
 from utils.deepseek_client import DeepSeekClient
+from utils.batched_llm import BatchedLLM
+from utils.llm_cache import CachingLLMClient
+from utils.json_loader import load_json_file
 from utils.document_builder import DocumentBuilder
 from utils.rag_engine import RAGEngine
+from utils.linkedin_scraper import import_from_linkedin_text
 from agents.job_analyzer import JobAnalyzer
-from agents.cv_customizer import CVCustomizer
-from agents.cover_letter_generator import CoverLetterGenerator
+from agents.agent_bundle import AgentBundle
 
 # Load config
 load_dotenv()
@@ -39,14 +48,87 @@ app.add_middleware(
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+class DownloadFiles(StaticFiles):
+    """
+    Static handler for generated documents.
+    Filenames carry a unique ID, so responses are immutable and cacheable forever.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers={"Cache-Control": "public, max-age=31536000, immutable"},
+            filename=os.path.basename(full_path),
+            stat_result=stat_result
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+app.mount("/static-output", DownloadFiles(directory=OUTPUT_DIR), name="output")
+
 # Initialize global engines
 api_key = os.getenv("DEEPSEEK_API_KEY")
 client = DeepSeekClient(api_key=api_key)
+# Agents go through the micro-batcher so concurrent /apply requests share dispatch windows
+batched_client = BatchedLLM(client, batch_size=8, wait_period=0.03)
+# Identical deterministic prompts (job analysis) are answered from disk before they reach the batcher
+llm_client = CachingLLMClient(batched_client)
 rag_engine = RAGEngine()
-job_analyzer = JobAnalyzer(client)
-cv_customizer = CVCustomizer(client)
-cover_letter_generator = CoverLetterGenerator(client)
-doc_builder = DocumentBuilder()
+job_analyzer = JobAnalyzer(llm_client)
+agent_bundle = AgentBundle(llm_client)
+
+# Worker threads for blocking LLM calls and DOCX serialization
+BLOCKING_IO_WORKERS = 32
+
+@app.on_event("startup")
+async def configure_thread_pool():
+    """Size the executor used by asyncio.to_thread so request bursts don't queue."""
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS))
+
+@app.on_event("startup")
+async def start_llm_batcher():
+    await batched_client.start()
+
+@app.on_event("shutdown")
+async def stop_llm_batcher():
+    await batched_client.stop()
+
+@app.on_event("startup")
+async def warm_llm_connection():
+    """Pay the TCP+TLS handshake at startup instead of on the first /apply."""
+    await asyncio.to_thread(client.warm_up)
+
+# Master profile, loaded once at startup and refreshed on LinkedIn import
+PROFILE_PATH = "data/master_profile.json"
+MASTER_PROFILE: Dict[str, Any] = {}
+
+@app.on_event("startup")
+async def load_master_profile():
+    """Load the master profile into memory so requests never touch the disk for it."""
+    try:
+        MASTER_PROFILE.update(load_json_file(PROFILE_PATH))
+    except FileNotFoundError:
+        print(f"⚠️  No profile found at {PROFILE_PATH}. Import one via /import-linkedin.")
+    except ValueError as e:
+        # Corrupt or non-JSON file: start empty instead of failing startup
+        print(f"⚠️  Could not parse profile at {PROFILE_PATH}: {e}. Import one via /import-linkedin.")
+
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+_WS_RE = re.compile(r'\s+')
+
+def sanitize(name: Any) -> str:
+    """Make a value safe to use inside a filename."""
+    return _WS_RE.sub('_', _SANITIZE_RE.sub('', str(name)).strip())
+
+def build_cv(cv_data: Dict[str, Any], path: str):
+    """Create a CV file with a fresh builder (builders hold per-document state)."""
+    DocumentBuilder().create_cv(cv_data, path)
+
+def build_cover_letter(letter_body: str, profile: Dict[str, Any], path: str):
+    """Create a cover letter file with a fresh builder."""
+    DocumentBuilder().create_cover_letter(letter_body, profile, path)
 
 class JobRequest(BaseModel):
     job_description: str
@@ -55,32 +137,36 @@ class JobRequest(BaseModel):
 async def root():
     return {"status": "online", "message": "Agentic AI Job Platform API is healthy"}
 
+@app.get("/health")
+async def health():
+    """Liveness probe: answers as soon as the server accepts connections."""
+    return {"status": "ok"}
+
 @app.post("/apply")
 async def process_application(request: JobRequest):
     """
     End-to-end application workflow:
-    Analysis -> RAG Retrieval -> Customization -> Generation
+    Analysis -> RAG Retrieval -> Customization + Cover Letter (one bundled call) -> Generation
     """
     try:
-        # 1. Analyze
-        analysis = job_analyzer.analyze(request.job_description)
+        # 1. Analyze (agents block on the batcher, so they run in worker threads)
+        analysis = await asyncio.to_thread(job_analyzer.analyze, request.job_description)
         
         # 2. RAG Retrieval (Strategic Improvement)
         keywords = analysis.get("keywords", {}).get("ats_keywords", [])
         relevant_snippets = rag_engine.retrieve_relevant_experience(keywords)
         
         # 3. Customize with RAG context
-        import json
-        with open("data/master_profile.json", "r") as f:
-            profile = json.load(f)
-            
-        customized_cv = cv_customizer.customize(profile, analysis, relevant_snippets)
-        cover_letter = cover_letter_generator.generate(profile, analysis)
+        if not MASTER_PROFILE:
+            raise ValueError("No profile found. Please import your LinkedIn profile first.")
+        # Shallow snapshot: a concurrent LinkedIn import swaps top-level keys, never mutates nested values
+        profile = dict(MASTER_PROFILE)
+
+        # One bundled call writes both documents (it falls back to the separate agents if incomplete)
+        documents = await asyncio.to_thread(agent_bundle.generate_all, profile, analysis, relevant_snippets)
+        customized_cv, cover_letter = documents["cv"], documents["cover_letter"]
 
         # 4. Generate Files with unique ID for download
-        import re
-        def sanitize(name): return re.sub(r'[<>:"/\\|?*]', '', str(name)).strip().replace(' ', '_')
-        
         role = sanitize(analysis.get('role_info', {}).get('title', 'Job'))
         company = sanitize(analysis.get('role_info', {}).get('company', 'Company'))
         
@@ -93,8 +179,11 @@ async def process_application(request: JobRequest):
         cv_path = os.path.join(OUTPUT_DIR, cv_filename)
         cl_path = os.path.join(OUTPUT_DIR, cl_filename)
         
-        doc_builder.create_cv(customized_cv, cv_path)
-        doc_builder.create_cover_letter(cover_letter, profile, cl_path)
+        # DOCX serialization is blocking: keep it off the event loop and write both files concurrently
+        await asyncio.gather(
+            asyncio.to_thread(build_cv, customized_cv, cv_path),
+            asyncio.to_thread(build_cover_letter, cover_letter, profile, cl_path)
+        )
 
         return {
             "success": True,
@@ -104,8 +193,8 @@ async def process_application(request: JobRequest):
                 "cover_letter": cl_filename
             },
             "download_urls": {
-                "cv": f"/download/{cv_filename}",
-                "cover_letter": f"/download/{cl_filename}"
+                "cv": f"/static-output/{quote(cv_filename)}",
+                "cover_letter": f"/static-output/{quote(cl_filename)}"
             }
         }
     except Exception as e:
@@ -113,17 +202,8 @@ async def process_application(request: JobRequest):
 
 @app.get("/download/{filename}")
 async def download_file(filename: str):
-    """Download generated CV or Cover Letter"""
-    file_path = os.path.join(OUTPUT_DIR, filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-    
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    )
+    """Download generated CV or Cover Letter (legacy path, redirects to the static mount)"""
+    return RedirectResponse(url=f"/static-output/{quote(filename)}", status_code=302)
 
 class LinkedInImportRequest(BaseModel):
     profile_text: str
@@ -135,10 +215,10 @@ async def import_linkedin_profile(request: LinkedInImportRequest):
     User copies their LinkedIn profile page content and pastes here.
     """
     try:
-        from utils.linkedin_scraper import import_from_linkedin_text
-        
-        # Parse and save the profile
-        profile = import_from_linkedin_text(request.profile_text, client)
+        # Parse and save the profile; runs off the event loop like the other LLM calls.
+        profile = await asyncio.to_thread(import_from_linkedin_text, request.profile_text, llm_client)
+        MASTER_PROFILE.clear()
+        MASTER_PROFILE.update(profile)
         
         # Reinitialize RAG engine with new profile
         global rag_engine
@@ -160,22 +240,16 @@ async def import_linkedin_profile(request: LinkedInImportRequest):
 @app.get("/profile")
 async def get_current_profile():
     """Get the current master profile"""
-    try:
-        import json
-        with open("data/master_profile.json", "r") as f:
-            profile = json.load(f)
-        
-        return {
-            "success": True,
-            "profile": profile
-        }
-    except FileNotFoundError:
+    if not MASTER_PROFILE:
         return {
             "success": False,
             "message": "No profile found. Please import your LinkedIn profile first."
         }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        "success": True,
+        "profile": MASTER_PROFILE
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -7,12 +7,24 @@ import os
 import sys
 import json
 import re
+import asyncio
+import hashlib
+import threading
+import concurrent.futures
+from typing import Dict, Any, Union
 from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 from flask_login import LoginManager, login_user, logout_user, current_user, login_required
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import joinedload
 from models import init_db, Profile, User
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
     try:
@@ -23,17 +35,38 @@ if sys.platform == 'win32':
 
 # Import our modular components
 from utils.deepseek_client import DeepSeekClient
+from utils.llm_cache import CachingLLMClient
+from utils.json_loader import load_json_file
 from utils.document_builder import DocumentBuilder
 from utils.match_calculator import MatchCalculator
-from agents.job_analyzer import JobAnalyzer
-from agents.cv_customizer import CVCustomizer
-from agents.cover_letter_generator import CoverLetterGenerator
+from agents.job_analyzer import JobAnalyzer, description_hash
+from agents.agent_bundle import AgentBundle
 
 # Load environment variables
 load_dotenv()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; produces the same JSON as the default provider."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        # Dates keep Flask's HTTP-date format via the default provider's fallback
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
+# Behind a front server that honours X-Sendfile (Apache mod_xsendfile, lighttpd, or nginx mapping it
+# to an internal location), send_file only emits the header and the server streams the file itself
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
 
 # Initialize database (SQLite by default, configurable via DATABASE_URL)
 init_db(app)
@@ -47,7 +80,8 @@ login_manager.init_app(app)
 @login_manager.user_loader
 def load_user(user_id: str):
     try:
-        return User.query.get(int(user_id))
+        # Eager-load the profile so handlers reading current_user.profile need no extra query
+        return User.query.options(joinedload(User.profile)).get(int(user_id))
     except Exception:
         return None
 
@@ -57,23 +91,65 @@ client = None
 builder = None
 match_calculator = None
 job_analyzer = None
-cv_customizer = None
-cover_letter_generator = None
+agent_bundle = None
+# Background event loop that runs the async AI pipeline on behalf of Flask's sync handlers
+pipeline_loop = None
+# A request gives up just before gunicorn would kill the worker, so the client gets a clean 504
+PIPELINE_TIMEOUT = int(os.getenv("GUNICORN_TIMEOUT", 300)) - 10
+# Creating the analysis queue on the fresh loop is instant; anything longer means the loop is stuck
+LOOP_STARTUP_TIMEOUT = 10
+# Job analyses submitted within BATCH_MS of each other are coalesced into one LLM call
+BATCH_MAX = 8
+BATCH_MS = 200
+analysis_queue = None
+# Strong references to the batcher's tasks so they are not garbage-collected mid-flight
+_batcher_tasks = set()
+
+# Components are built once per API key (by hash) and reused across submissions
+_components_lock = threading.Lock()
+_components_key = None
 
 def initialize_components():
-    """Initialize all AI components."""
-    global client, builder, match_calculator, job_analyzer, cv_customizer, cover_letter_generator
+    """
+    Initialize all AI components.
+    Cheap to call per request: components (and the client's pooled HTTP connections) are only
+    rebuilt when the configured API key changes.
+    """
+    global _components_key
     
     api_key = os.getenv("DEEPSEEK_API_KEY")
     if not api_key:
         raise ValueError("DEEPSEEK_API_KEY not found in environment variables")
-    
-    client = DeepSeekClient(api_key=api_key)
+    key = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    with _components_lock:
+        if key != _components_key:
+            _build_components(api_key)
+            _components_key = key
+
+def _build_components(api_key: str):
+    """Construct the client and agents (caller holds _components_lock)."""
+    global client, builder, match_calculator, job_analyzer, agent_bundle, pipeline_loop, analysis_queue
+
+    client = DeepSeekClient(api_key=api_key, prewarm=True)
+    os.makedirs("output", exist_ok=True)
     builder = DocumentBuilder()
     match_calculator = MatchCalculator()
-    job_analyzer = JobAnalyzer(client)
-    cv_customizer = CVCustomizer(client)
-    cover_letter_generator = CoverLetterGenerator(client)
+    # Agents go through the disk-backed response cache so repeated job analyses skip the API
+    llm_client = CachingLLMClient(client)
+    job_analyzer = JobAnalyzer(llm_client)
+    agent_bundle = AgentBundle(llm_client)
+
+    if pipeline_loop is None:
+        pipeline_loop = asyncio.new_event_loop()
+        threading.Thread(target=pipeline_loop.run_forever, name="ai-pipeline-loop", daemon=True).start()
+    if analysis_queue is None:
+        future = asyncio.run_coroutine_threadsafe(_start_analysis_batcher(), pipeline_loop)
+        try:
+            analysis_queue = future.result(timeout=LOOP_STARTUP_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
 
 def load_profile(path: str = "data/master_profile.json") -> dict:
     """
@@ -85,7 +161,7 @@ def load_profile(path: str = "data/master_profile.json") -> dict:
     """
     # 1. Try DB first
     if current_user.is_authenticated:
-        profile_row = Profile.get_or_create_for_user(current_user.id)
+        profile_row = current_user.profile or Profile.get_or_create_for_user(current_user.id)
     else:
         profile_row = Profile.get_singleton_profile()
     data = profile_row.to_dict()
@@ -94,19 +170,115 @@ def load_profile(path: str = "data/master_profile.json") -> dict:
 
     # 2. Fallback: import from existing JSON file (one-time migration)
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
-            profile_row.update_from_dict(file_data)
-            return file_data
+        file_data = load_json_file(path)
+        profile_row.update_from_dict(file_data)
+        return file_data
     except FileNotFoundError:
         # If no file and no DB data, return empty profile structure
         return {}
     except json.JSONDecodeError:
         raise ValueError(f"Invalid JSON in {path}")
 
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+
 def sanitize_filename(name: str) -> str:
     """Sanitize filename for Windows."""
-    return re.sub(r'[<>:"/\\|?*]', '', name).strip().replace(' ', '_')
+    return _SANITIZE_RE.sub('', name).strip().replace(' ', '_')
+
+async def _start_analysis_batcher() -> asyncio.Queue:
+    """Create the analysis queue and its consumer on the pipeline loop."""
+    queue = asyncio.Queue()
+    _track(asyncio.get_running_loop().create_task(_drain_analysis_queue(queue)))
+    return queue
+
+def _track(task: asyncio.Task):
+    """Keep a reference to a background task until it finishes."""
+    _batcher_tasks.add(task)
+    task.add_done_callback(_batcher_tasks.discard)
+
+async def _drain_analysis_queue(queue: asyncio.Queue):
+    """Collect pending job analyses for up to BATCH_MS (or BATCH_MAX items) and dispatch them together."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BATCH_MS / 1000
+        while len(batch) < BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        _track(loop.create_task(_dispatch_analyses(batch)))
+
+async def _dispatch_analyses(batch):
+    """Analyze one batch of (job_description, future) pairs and resolve the futures."""
+    job_descriptions = [jd for jd, _ in batch]
+    try:
+        if len(batch) == 1:
+            results = [await asyncio.to_thread(job_analyzer.analyze, job_descriptions[0])]
+        else:
+            results = await asyncio.to_thread(job_analyzer.analyze_batch, job_descriptions)
+    except Exception as e:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for (_, future), analysis in zip(batch, results):
+        if not future.done():
+            future.set_result(analysis)
+
+async def analyze_job(job_description: str) -> Dict[str, Any]:
+    """Queue a job description for (possibly batched) analysis and wait for its result."""
+    future = asyncio.get_running_loop().create_future()
+    await analysis_queue.put((job_description, future))
+    return await future
+
+async def run_ai_pipeline_async(profile: Dict[str, Any], job_description: str, profile_key: Any = None) -> Dict[str, Any]:
+    """
+    Run analysis -> CV customization + cover letter (one bundled call) -> documents.
+
+    The LLM calls are blocking, so each runs in a worker thread. profile_key identifies
+    the profile version for the match calculator's cache.
+    """
+    # Analyze job
+    analysis = await analyze_job(job_description)
+    role_title = analysis.get('role_info', {}).get('title', 'Unknown Role')
+    company = analysis.get('role_info', {}).get('company', 'Unknown Company')
+
+    # Calculate match score
+    match_data = match_calculator.calculate_match_score(
+        profile, analysis, cache_key=profile_key, job_key=description_hash(job_description)
+    )
+
+    # Customize CV and write the cover letter in one bundled call (same path as the CLI and API)
+    documents = await asyncio.to_thread(agent_bundle.generate_all, profile, analysis)
+    customized_cv, cover_letter_text = documents["cv"], documents["cover_letter"]
+
+    # Generate documents (output/ is created once in initialize_components)
+    safe_title = sanitize_filename(role_title)
+    safe_company = sanitize_filename(company)
+
+    cv_filename = f"output/CV_{safe_company}_{safe_title}.docx"
+    cl_filename = f"output/CL_{safe_company}_{safe_title}.docx"
+
+    # Create documents (a fresh builder per document, written concurrently)
+    await asyncio.gather(
+        asyncio.to_thread(DocumentBuilder().create_cv, customized_cv, cv_filename),
+        asyncio.to_thread(DocumentBuilder().create_cover_letter, cover_letter_text, profile, cl_filename)
+    )
+
+    return {
+        'success': True,
+        'role_title': role_title,
+        'company': company,
+        'match_score': match_data,
+        'cv_file': cv_filename,
+        'cover_letter_file': cl_filename,
+        'analysis': analysis
+    }
 
 @app.route('/')
 @login_required
@@ -131,7 +303,7 @@ def index():
 def process_job():
     """Process job description and generate CV/cover letter."""
     try:
-        data = request.json
+        data = request.get_json()
         job_description = data.get('job_description', '').strip()
         
         if not job_description or len(job_description) < 50:
@@ -141,50 +313,27 @@ def process_job():
             }), 400
         
         # Initialize components if not already done
-        if client is None:
-            initialize_components()
+        initialize_components()
         
-        # Load profile
+        # Load profile (DB access stays on the request thread)
         profile = load_profile()
+        # Profile version key lets the match calculator reuse its tokenization across jobs
+        profile_row = current_user.profile
+        profile_key = (current_user.id, profile_row.updated_at) if profile_row is not None else None
         
-        # Analyze job
-        analysis = job_analyzer.analyze(job_description)
-        role_title = analysis.get('role_info', {}).get('title', 'Unknown Role')
-        company = analysis.get('role_info', {}).get('company', 'Unknown Company')
-        
-        # Calculate match score
-        match_data = match_calculator.calculate_match_score(profile, analysis)
-        
-        # Customize CV
-        customized_cv = cv_customizer.customize(profile, analysis)
-        
-        # Generate cover letter
-        cover_letter_text = cover_letter_generator.generate(profile, analysis)
-        
-        # Generate documents
-        os.makedirs("output", exist_ok=True)
-        safe_title = sanitize_filename(role_title)
-        safe_company = sanitize_filename(company)
-        
-        cv_filename = f"output/CV_{safe_company}_{safe_title}.docx"
-        cl_filename = f"output/CL_{safe_company}_{safe_title}.docx"
-        
-        # Create documents (reuse builder but create new instances for each)
-        cv_builder = DocumentBuilder()
-        cv_builder.create_cv(customized_cv, cv_filename)
-        
-        cl_builder = DocumentBuilder()
-        cl_builder.create_cover_letter(cover_letter_text, profile, cl_filename)
-        
-        return jsonify({
-            'success': True,
-            'role_title': role_title,
-            'company': company,
-            'match_score': match_data,
-            'cv_file': cv_filename,
-            'cover_letter_file': cl_filename,
-            'analysis': analysis
-        })
+        # Run the AI pipeline on the background loop and wait for the result
+        future = asyncio.run_coroutine_threadsafe(
+            run_ai_pipeline_async(profile, job_description, profile_key), pipeline_loop
+        )
+        try:
+            result = future.result(timeout=PIPELINE_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return jsonify({
+                'success': False,
+                'error': f'Processing timed out after {PIPELINE_TIMEOUT} seconds. Please try again.'
+            }), 504
+        return jsonify(result)
         
     except ValueError as e:
         return jsonify({
@@ -205,11 +354,9 @@ def download_file(filename):
         if not filename.startswith('output/'):
             return jsonify({'error': 'Invalid file path'}), 403
         
-        file_path = filename
-        if not os.path.exists(file_path):
-            return jsonify({'error': 'File not found'}), 404
-        
-        return send_file(file_path, as_attachment=True)
+        return send_file(filename, as_attachment=True)
+    except FileNotFoundError:
+        return jsonify({'error': 'File not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -229,7 +376,7 @@ def get_profile():
 def update_profile():
     """Update profile and persist to DB."""
     try:
-        data = request.json
+        data = request.get_json()
         profile_data = data.get('profile')
 
         if not profile_data:
@@ -239,7 +386,7 @@ def update_profile():
             return jsonify({'success': False, 'error': 'Name is required'}), 400
 
         if current_user.is_authenticated:
-            profile_row = Profile.get_or_create_for_user(current_user.id)
+            profile_row = current_user.profile or Profile.get_or_create_for_user(current_user.id)
         else:
             profile_row = Profile.get_singleton_profile()
         profile_row.update_from_dict(profile_data)
@@ -312,4 +459,6 @@ if __name__ == '__main__':
     print("📱 Open your browser and go to: http://localhost:5000")
     print("🛑 Press Ctrl+C to stop the server\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; debug mode (reloader + debugger) requires FLASK_DEV=1.
+    # For production use: gunicorn -c gunicorn.conf.py app:app
+    app.run(debug=os.getenv('FLASK_DEV') == '1', host='0.0.0.0', port=5000, threaded=True)
@@ -1,10 +1,18 @@
 import sys
-try:
-    import google.generativeai
-    import docx
-    import tenacity
-    import dotenv
-    print("✅ All dependencies imported successfully!")
-except ImportError as e:
-    print(f"❌ Import Error: {e}")
+from importlib.util import find_spec
+
+# Probe for each dependency without importing it (google.generativeai alone pulls in gRPC/protobuf)
+REQUIRED_MODULES = ["google.generativeai", "docx", "dotenv"]
+
+def is_installed(module: str) -> bool:
+    try:
+        return find_spec(module) is not None
+    except ModuleNotFoundError:
+        # Parent package (e.g. "google") is missing
+        return False
+
+missing = [module for module in REQUIRED_MODULES if not is_installed(module)]
+if missing:
+    print(f"❌ Missing dependencies: {', '.join(missing)}")
     sys.exit(1)
+print("✅ All dependencies found!")
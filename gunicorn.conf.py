@@ -0,0 +1,29 @@
+"""
+Gunicorn Configuration
+Role: Production server settings for the Flask web app (gunicorn -c gunicorn.conf.py app:app).
+"""
+
+import os
+import multiprocessing
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# Threaded workers: /api/process blocks its request thread while the AI pipeline runs on the
+# worker's asyncio loop, so each worker needs several request threads to keep serving other calls.
+# (gevent workers are avoided on purpose: monkey-patching threading breaks that background loop.)
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+# A full pipeline run (analysis + CV + cover letter) can take well over a minute
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 300))
+keepalive = 5
+
+def post_worker_init(worker):
+    """Build the AI components before the worker takes its first request."""
+    from app import initialize_components
+    try:
+        initialize_components()
+        print(f"✅ Worker {worker.pid}: all components initialized")
+    except Exception as e:
+        print(f"⚠️  Worker {worker.pid}: could not initialize components: {e}")
@@ -6,9 +6,11 @@ Role: Coordinate the workflow between JobAnalyzer, CVCustomizer, and DocumentBui
 """
 
 import os
+import re
 import sys
 import json
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List
 from dotenv import load_dotenv
 
 # Fix Windows console encoding for emojis
@@ -21,11 +23,12 @@ if sys.platform == 'win32':
 
 # Import our modular components
 from utils.deepseek_client import DeepSeekClient
+from utils.llm_cache import CachingLLMClient
+from utils.json_loader import load_json_file
 from utils.document_builder import DocumentBuilder
 from utils.match_calculator import MatchCalculator
 from agents.job_analyzer import JobAnalyzer
-from agents.cv_customizer import CVCustomizer
-from agents.cover_letter_generator import CoverLetterGenerator
+from agents.agent_bundle import AgentBundle
 from utils.rag_engine import RAGEngine
 
 # Load environment variables
@@ -45,8 +48,7 @@ def load_profile(path: str = "data/master_profile.json") -> Dict[str, Any]:
         SystemExit: If file not found or invalid JSON
     """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_file(path)
     except FileNotFoundError:
         print(f"❌ Error: Profile file not found at {path}")
         print("💡 Tip: Update 'data/master_profile.json' with your details.")
@@ -55,6 +57,21 @@ def load_profile(path: str = "data/master_profile.json") -> Dict[str, Any]:
         print(f"❌ Error: Invalid JSON in {path}")
         sys.exit(1)
 
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+@lru_cache(maxsize=128)
+def _keyword_pattern(keywords: frozenset) -> "re.Pattern":
+    """
+    Compile a single-pass scanner for a set of lowercased keywords.
+
+    The alternation sits inside a lookahead so every start position is tried,
+    and longest keywords are listed first so each hit covers the longest keyword
+    starting there. Any shorter keyword starting at the same position is then a
+    prefix of that hit.
+    """
+    alternation = "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+    return re.compile(f"(?=({alternation}))")
+
 def calculate_match_score(customized_cv: Dict[str, Any], job_keywords: List[str]) -> Dict[str, Any]:
     """
     Calculate the keyword match score between the CV and Job requirements.
@@ -67,27 +84,33 @@ def calculate_match_score(customized_cv: Dict[str, Any], job_keywords: List[str]
         Dictionary with score metrics
     """
     # 1. Flatten CV content into a single string for searching
-    cv_text = f"{customized_cv.get('summary', '')} "
+    # LLM output can carry explicit nulls, so fall back to '' before joining
+    parts = [customized_cv.get('summary') or '']
     
     # Add skills
     skills_data = customized_cv.get('skills', {})
     if isinstance(skills_data, dict):
-        for category in skills_data:
-            cv_text += " ".join(skills_data[category]) + " "
+        parts.extend(skill for category in skills_data.values() for skill in category)
     
     # Add experience achievements
     for role in customized_cv.get('experience', []):
-        cv_text += f"{role.get('title', '')} "
-        cv_text += " ".join(role.get('achievements', [])) + " "
+        parts.append(role.get('title') or '')
+        parts.extend(role.get('achievements', []))
     
-    cv_text = cv_text.lower()
+    cv_text = " ".join(parts).lower() + " "
     
-    # 2. Count matches
+    # 2. Count matches. Single-token keywords are resolved by set membership against
+    # the CV's tokens; only the rest (multi-word or partial-word hits) need the regex scan.
+    tokens = set(_TOKEN_RE.findall(cv_text))
+    keywords = frozenset(kw.lower() for kw in job_keywords if kw) - tokens
+    hits = set(_keyword_pattern(keywords).findall(cv_text)) if keywords else set()
+
     matched = []
     missing = []
     
     for kw in job_keywords:
-        if kw.lower() in cv_text:
+        kw_lower = kw.lower()
+        if not kw_lower or kw_lower in tokens or kw_lower in hits or any(kw_lower in hit for hit in hits):
             matched.append(kw)
         else:
             missing.append(kw)
@@ -103,6 +126,12 @@ def calculate_match_score(customized_cv: Dict[str, Any], job_keywords: List[str]
         "missing_list": missing
     }
 
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+
+def sanitize_filename(name: str) -> str:
+    """Sanitize filename for Windows."""
+    return _SANITIZE_RE.sub('', name).strip().replace(' ', '_')
+
 def get_job_description() -> str:
     """
     Get job description from user input.
@@ -111,14 +140,8 @@ def get_job_description() -> str:
         Job description text as a string
     """
     print("\n📋 Paste the Job Description below (Press Ctrl+Z/D then Enter when done):")
-    lines = []
-    try:
-        while True:
-            line = input()
-            lines.append(line)
-    except EOFError:
-        pass
-    return "\n".join(lines)
+    # Read the whole paste in one buffered call instead of line by line
+    return sys.stdin.read().rstrip("\n")
 
 def main():
     """
@@ -134,14 +157,14 @@ def main():
         return
 
     try:
-        client = DeepSeekClient(api_key=api_key)
+        client = DeepSeekClient(api_key=api_key, prewarm=True)
         builder = DocumentBuilder()
         match_calculator = MatchCalculator()
         
         # Initialize Agents
-        job_analyzer = JobAnalyzer(client)
-        cv_customizer = CVCustomizer(client)
-        cover_letter_generator = CoverLetterGenerator(client)
+        llm_client = CachingLLMClient(client)
+        job_analyzer = JobAnalyzer(llm_client)
+        agent_bundle = AgentBundle(llm_client)
         rag_engine = RAGEngine()
 
         # 2. Load Data
@@ -169,9 +192,11 @@ def main():
         keywords = analysis.get("keywords", {}).get("ats_keywords", [])
         relevant_snippets = rag_engine.retrieve_relevant_experience(keywords)
         
-        # 5. Customize CV
-        print("\n🎨 Phase 2: Customizing CV...")
-        customized_cv = cv_customizer.customize(profile, analysis, relevant_snippets)
+        # 5. Customize CV + Write Cover Letter (single LLM call)
+        print("\n🎨 Phase 2: Customizing CV & Writing Cover Letter...")
+        generated = agent_bundle.generate_all(profile, analysis, relevant_snippets)
+        customized_cv = generated["cv"]
+        cover_letter_text = generated["cover_letter"]
         print("✅ CV content customized for ATS optimization.")
 
         # 5.1 Calculate Match Score (New Validation Step)
@@ -183,17 +208,8 @@ def main():
         if match_metrics['score'] < 70:
             print(f"   ⚠️  Warning: Lower match score. Consider adding more details to your master profile.")
         
-        # 6. Generate Information
-        print("\n✍️  Phase 3: Writing Cover Letter...")
-        cover_letter_text = cover_letter_generator.generate(profile, analysis)
-
-        # 7. Generate Documents
-        print("\n📄 Phase 4: Generating Documents...")
-        # Sanitize filename for Windows
-        import re
-        def sanitize_filename(name):
-            return re.sub(r'[<>:"/\\|?*]', '', name).strip().replace(' ', '_')
-
+        # 6. Generate Documents
+        print("\n📄 Phase 3: Generating Documents...")
         safe_title = sanitize_filename(role_title)
         safe_company = sanitize_filename(company)
         
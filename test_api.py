@@ -12,7 +12,13 @@ def test_api():
     print("🚀 Starting API server for testing...")
     # Start server in background
     process = subprocess.Popen(["py", "api.py"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    time.sleep(5) # Wait for server to boot
+    # Wait for the server to accept connections (up to ~5s) instead of a fixed sleep
+    for _ in range(50):
+        try:
+            requests.get("http://127.0.0.1:8000/health", timeout=0.2)
+            break
+        except requests.exceptions.RequestException:
+            time.sleep(0.1)
     
     try:
         url = "http://127.0.0.1:8000/apply"
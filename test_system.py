@@ -6,7 +6,15 @@ This script checks dependencies, configuration, and basic functionality.
 import sys
 import os
 import json
+from functools import lru_cache, partial
+from importlib.util import find_spec
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
@@ -16,19 +24,19 @@ if sys.platform == 'win32':
         pass
 
 def check_dependencies():
-    """Check if all required packages are installed."""
+    """Check if all required packages are installed (located via find_spec, not imported)."""
     print("🔍 Checking dependencies...")
     required = {
         'openai': 'openai',
         'docx': 'python-docx',
-        'tenacity': 'tenacity',
         'dotenv': 'python-dotenv'
     }
     
     missing = []
     for module, package in required.items():
         try:
-            __import__(module)
+            if find_spec(module) is None:
+                raise ImportError(module)
             print(f"  ✅ {package}")
         except ImportError:
             print(f"  ❌ {package} (missing)")
@@ -40,21 +48,44 @@ def check_dependencies():
         return False
     return True
 
-def check_env_file():
+@lru_cache(maxsize=1)
+def _env():
+    """
+    Read .env once and merge it with the process environment.
+    Real environment variables take precedence, matching load_dotenv()'s default.
+    """
+    from dotenv import dotenv_values
+    return MappingProxyType({**dotenv_values(".env"), **os.environ})
+
+def scan_paths(root: str = ".", max_depth: int = 2):
+    """
+    Collect every path under root, down to max_depth levels, in a single os.walk.
+
+    Returns:
+        Set of relative paths using "/" separators (e.g. "agents/job_analyzer.py")
+    """
+    paths = set()
+    for dirpath, dirnames, filenames in os.walk(root, topdown=True):
+        rel = os.path.relpath(dirpath, root)
+        prefix = "" if rel == "." else rel.replace(os.sep, "/") + "/"
+        for name in dirnames + filenames:
+            paths.add(prefix + name)
+        if prefix.count("/") + 1 >= max_depth:
+            dirnames[:] = []  # Don't descend any further
+    return paths
+
+def check_env_file(paths=None):
     """Check if .env file exists and has API key."""
     print("\n🔍 Checking environment configuration...")
-    env_path = Path(".env")
+    paths = scan_paths() if paths is None else paths
     
-    if not env_path.exists():
+    if ".env" not in paths:
         print("  ⚠️  .env file not found")
         print("  💡 Create .env file with: DEEPSEEK_API_KEY=your_key_here")
         return False
     
     # Check if API key is set (don't print the actual key)
-    from dotenv import load_dotenv
-    load_dotenv()
-    
-    api_key = os.getenv("DEEPSEEK_API_KEY")
+    api_key = _env().get("DEEPSEEK_API_KEY")
     if not api_key or api_key == "your_deepseek_api_key_here":
         print("  ⚠️  DEEPSEEK_API_KEY not set or using placeholder")
         print("  💡 Update .env file with your actual API key")
@@ -63,18 +94,19 @@ def check_env_file():
     print("  ✅ .env file found with API key configured")
     return True
 
-def check_profile():
+def check_profile(paths=None):
     """Check if master profile exists and is valid JSON."""
     print("\n🔍 Checking master profile...")
+    paths = scan_paths() if paths is None else paths
     profile_path = Path("data/master_profile.json")
     
-    if not profile_path.exists():
+    if "data/master_profile.json" not in paths:
         print("  ❌ data/master_profile.json not found")
         return False
     
     try:
-        with open(profile_path, 'r', encoding='utf-8') as f:
-            profile = json.load(f)
+        raw = profile_path.read_bytes()
+        profile = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
         # Check required fields
         required_fields = ['personal_info', 'summary', 'skills', 'experience']
@@ -95,9 +127,71 @@ def check_profile():
         print(f"  ❌ Error reading profile: {e}")
         return False
 
-def check_structure():
+def check_match_scoring():
+    """Check the skill matcher on known tricky pairs (prefix matches must not over-match)."""
+    print("\n🔍 Checking match scoring...")
+    from utils.match_calculator import MatchCalculator
+    
+    profile = {"skills": ["JavaScript", "Communication Skills", "PostgreSQL"]}
+    cases = [
+        # (required skill, expected to match)
+        ("Java", False),       # must not match "javascript"
+        ("Commerce", False),   # must not match "communication"
+        ("C", False),
+        ("Postgres", True),    # "postgresql" is the same skill
+    ]
+    
+    all_good = True
+    calculator = MatchCalculator()
+    for skill, expected in cases:
+        job = {"requirements": {"must_have_skills": [skill]}}
+        matched = calculator.calculate_match_score(profile, job)["required_skills_matched"] == 1
+        if matched == expected:
+            print(f"  ✅ {skill}: {'match' if expected else 'no match'}")
+        else:
+            print(f"  ❌ {skill}: expected {'match' if expected else 'no match'}")
+            all_good = False
+    
+    return all_good
+
+def check_document_roundtrip():
+    """Check that DOCX files written by DocumentBuilder reopen in python-docx with the same text."""
+    print("\n🔍 Checking document round-trip...")
+    import tempfile
+    from docx import Document
+    from utils.document_builder import DocumentBuilder
+    
+    cv_data = {
+        "personal_info": {"name": "Jane Doe", "email": "jane@example.com"},
+        "summary": "Backend engineer.",
+        "skills": {"Technical": ["Python", "SQL"]},
+        "experience": [{"title": "Engineer", "company": "Acme", "responsibilities": ["Built APIs"]}],
+    }
+    
+    all_good = True
+    with tempfile.TemporaryDirectory() as tmp:
+        builders = [
+            ("CV", lambda builder, path: builder.create_cv(cv_data, path)),
+            ("Cover letter", lambda builder, path: builder.create_cover_letter("Dear team,\nI am applying.", cv_data, path)),
+        ]
+        for label, build in builders:
+            builder = DocumentBuilder()
+            path = os.path.join(tmp, f"{label}.docx")
+            build(builder, path)
+            expected = [p.text for p in builder.doc.paragraphs]
+            actual = [p.text for p in Document(path).paragraphs]
+            if actual == expected:
+                print(f"  ✅ {label}: {len(actual)} paragraphs round-tripped")
+            else:
+                print(f"  ❌ {label}: reopened text differs from what was written")
+                all_good = False
+    
+    return all_good
+
+def check_structure(paths=None):
     """Check if project structure is correct."""
     print("\n🔍 Checking project structure...")
+    paths = scan_paths() if paths is None else paths
     
     required_dirs = ['agents', 'utils', 'data', 'output']
     required_files = [
@@ -112,14 +206,14 @@ def check_structure():
     all_good = True
     
     for dir_name in required_dirs:
-        if Path(dir_name).exists():
+        if dir_name in paths:
             print(f"  ✅ {dir_name}/")
         else:
             print(f"  ❌ {dir_name}/ (missing)")
             all_good = False
     
     for file_name in required_files:
-        if Path(file_name).exists():
+        if file_name in paths:
             print(f"  ✅ {file_name}")
         else:
             print(f"  ❌ {file_name} (missing)")
@@ -133,11 +227,16 @@ def main():
     print("🧪 AI-Powered Job Application Agent - System Test")
     print("=" * 60)
     
+    # One directory walk answers every existence check below
+    paths = scan_paths()
+    
     checks = [
         ("Dependencies", check_dependencies),
-        ("Project Structure", check_structure),
-        ("Master Profile", check_profile),
-        ("Environment Config", check_env_file),
+        ("Project Structure", partial(check_structure, paths)),
+        ("Master Profile", partial(check_profile, paths)),
+        ("Environment Config", partial(check_env_file, paths)),
+        ("Match Scoring", check_match_scoring),
+        ("Document Round-Trip", check_document_roundtrip),
     ]
     
     results = []
@@ -0,0 +1,34 @@
+"""
+Utilities package.
+Role: Expose the main helpers as `from utils import X` without importing every submodule
+(and its SDK dependencies) up front.
+"""
+
+import os
+import importlib
+
+_LAZY_EXPORTS = {
+    "DeepSeekClient": ".deepseek_client",
+    "AsyncDeepSeekClient": ".deepseek_client",
+    "GeminiClient": ".gemini_client",
+    "DocumentBuilder": ".document_builder",
+    "LinkedInScraper": ".linkedin_scraper",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    """Resolve a lazily exported name on first access (PEP 562)."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+if os.getenv("AI_AGENT_EAGER_IMPORT") == "1":
+    for _name in __all__:
+        __getattr__(_name)
@@ -0,0 +1,134 @@
+"""
+Batched LLM Client
+Role: Coalesce concurrent LLM requests into micro-batches behind the DeepSeekClient interface.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from utils.deepseek_client import DeepSeekClient
+
+class BatchedLLM:
+    """
+    Wrapper around DeepSeekClient that collects requests for up to `wait_period` seconds
+    (or until `batch_size` are queued) and dispatches them together.
+
+    The DeepSeek chat endpoint has no multi-prompt request, so a batch is sent as concurrent
+    individual calls on a dedicated pool of `max_concurrency` threads. Agents keep calling the
+    synchronous generate_json/generate_content methods, from worker threads.
+    """
+
+    def __init__(self, client: DeepSeekClient, batch_size: int = 8, wait_period: float = 0.03, max_concurrency: int = 20):
+        """
+        Initialize the batcher.
+
+        Args:
+            client: The underlying DeepSeek client
+            batch_size: Maximum number of requests per batch
+            wait_period: Seconds to wait for more requests after the first one arrives
+            max_concurrency: Maximum number of LLM calls in flight
+        """
+        self.client = client
+        self.model_name = client.model_name
+        self.batch_size = batch_size
+        self.wait_period = wait_period
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-batch")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    async def start(self):
+        """Start the background drain task on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._drain())
+
+    async def stop(self):
+        """Stop batching; in-flight calls are allowed to finish."""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def submit(self, method: str, *args, **kwargs) -> asyncio.Future:
+        """
+        Queue a client call for the next batch.
+
+        Args:
+            method: Name of the DeepSeekClient method ("generate_json" or "generate_content")
+
+        Returns:
+            Future resolved with the method's return value
+        """
+        future = self._loop.create_future()
+        await self._queue.put((method, args, kwargs, future))
+        return future
+
+    async def _drain(self):
+        """Collect requests into batches and hand each batch off for dispatch."""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.wait_period
+            while len(batch) < self.batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, tuple, Dict[str, Any], asyncio.Future]]):
+        """Send one batch and resolve the callers' futures."""
+        if len(batch) > 1:
+            print(f"📦 Dispatching batch of {len(batch)} LLM requests...")
+
+        results = await asyncio.gather(
+            *(self._loop.run_in_executor(self._executor, functools.partial(getattr(self.client, method), *args, **kwargs))
+              for method, args, kwargs, _ in batch),
+            return_exceptions=True
+        )
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        """Run a call through the batcher, blocking the calling worker thread until it completes."""
+        if self._worker is None:
+            # Not started (e.g. CLI usage): behave like the plain client
+            return getattr(self.client, method)(*args, **kwargs)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            raise RuntimeError("BatchedLLM must be called from a worker thread, not the event loop")
+
+        async def submit_and_wait():
+            return await (await self.submit(method, *args, **kwargs))
+
+        return asyncio.run_coroutine_threadsafe(submit_and_wait(), self._loop).result()
+
+    def generate_content(self, *args, **kwargs) -> str:
+        """Batched DeepSeekClient.generate_content."""
+        return self._call("generate_content", *args, **kwargs)
+
+    def generate_json(self, *args, **kwargs) -> Dict[str, Any]:
+        """Batched DeepSeekClient.generate_json."""
+        return self._call("generate_json", *args, **kwargs)
@@ -4,37 +4,99 @@ Role: Handle all interactions with DeepSeek API via OpenAI client with robust er
 """
 
 from typing import Dict, Any, Optional
-import json
 import os
-from openai import OpenAI, APIError, RateLimitError
-from tenacity import retry, stop_after_attempt, wait_exponential
+import time
+import asyncio
+import threading
+from importlib.util import find_spec
+from utils.json_loader import parse_json_safe
+
+# The OpenAI SDK is imported on first client construction (it adds ~200ms to startup)
+OpenAI = None
+AsyncOpenAI = None
+APIError = None
+RateLimitError = None
+
+def _load_openai():
+    """Import the OpenAI SDK into this module's namespace."""
+    global OpenAI, AsyncOpenAI, APIError, RateLimitError
+    if OpenAI is None:
+        from openai import OpenAI, AsyncOpenAI, APIError, RateLimitError
+
+if os.getenv("AI_AGENT_EAGER_IMPORT") == "1":
+    _load_openai()
+
+DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+
+# Retry policy for API errors: 3 attempts, waiting 2s then 4s (capped at 10s)
+MAX_ATTEMPTS = 3
+
+def _retry_delay(attempt: int) -> float:
+    """Seconds to wait after the given (0-based) failed attempt."""
+    return min(10, 2 ** (attempt + 1))
+
+# One keep-alive connection pool per process, shared by every DeepSeekClient
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def _shared_http_client():
+    """Return the process-wide httpx client (HTTP/2 when the h2 package is installed)."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            import httpx
+            _http_client = httpx.Client(
+                http2=find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=100),
+                timeout=httpx.Timeout(600.0, connect=5.0),
+                follow_redirects=True
+            )
+        return _http_client
 
 class DeepSeekClient:
     """
     Wrapper for DeepSeek API (OpenAI-compatible) to handle configuration, generation, and error handling.
     """
     
-    def __init__(self, api_key: str, model_name: str = "deepseek-chat"):
+    def __init__(self, api_key: str, model_name: str = "deepseek-chat", prewarm: bool = False):
         """
         Initialize the DeepSeek client.
 
         Args:
             api_key: DeepSeek API Key
             model_name: Model version to use (default: deepseek-chat)
+            prewarm: Open the connection (DNS + TLS) on a background thread right away
         """
         if not api_key:
             raise ValueError("API key is required for DeepSeekClient")
             
+        _load_openai()
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://api.deepseek.com"
+            base_url=DEEPSEEK_BASE_URL,
+            http_client=_shared_http_client()
         )
         self.model_name = model_name
 
-    @retry(
-        stop=stop_after_attempt(3), 
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
+        if prewarm:
+            threading.Thread(target=self.warm_up, name="deepseek-warm-up", daemon=True).start()
+
+    def warm_up(self) -> bool:
+        """
+        Open the pooled HTTPS connection ahead of the first real call.
+
+        Uses the token-free models endpoint, so it costs a handshake and no generation.
+
+        Returns:
+            True if the endpoint was reachable
+        """
+        try:
+            self.client.models.list()
+            return True
+        except Exception as e:
+            print(f"⚠️  DeepSeek warm-up failed: {e}")
+            return False
+
     def generate_content(self, prompt: str, system_instruction: str = "", config: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate text content from DeepSeek with retry logic.
@@ -47,31 +109,43 @@ class DeepSeekClient:
         Returns:
             Generated text string
         """
-        try:
-            print(f"🤖 User: Calling DeepSeek ({self.model_name})...")
-            temperature = config.get("temperature", 0.7) if config else 0.7
-            
-            messages = []
-            if system_instruction:
-                messages.append({"role": "system", "content": system_instruction})
-            messages.append({"role": "user", "content": prompt})
-
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                temperature=temperature,
-                stream=False
-            )
-            return response.choices[0].message.content
-            
-        except RateLimitError:
-            print("⚠️  Rate limit exceeded. Retrying...")
-            raise
-        except Exception as e:
-            print(f"❌ DeepSeek API Error: {e}")
-            raise
+        temperature = config.get("temperature", 0.7) if config else 0.7
+
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        messages.append({"role": "user", "content": prompt})
+
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                print(f"🤖 User: Calling DeepSeek ({self.model_name})...")
 
-    def generate_json(self, prompt: str, system_instruction: str = "", temperature: float = 0.0) -> Dict[str, Any]:
+                # Stream so the connection starts delivering tokens immediately; chunks are joined once at the end
+                stream = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    stream=True
+                )
+                parts = []
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                return "".join(parts)
+
+            except (RateLimitError, APIError) as e:
+                if isinstance(e, RateLimitError):
+                    print("⚠️  Rate limit exceeded. Retrying...")
+                else:
+                    print(f"❌ DeepSeek API Error: {e}")
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                time.sleep(_retry_delay(attempt))
+            except Exception as e:
+                print(f"❌ DeepSeek API Error: {e}")
+                raise
+
+    def generate_json(self, prompt: str, system_instruction: str = "", temperature: float = 0.0, ensure_json_hint: bool = True) -> Dict[str, Any]:
         """
         Generate and parse JSON content.
 
@@ -79,6 +153,8 @@ class DeepSeekClient:
             prompt: Input prompt requesting JSON
             system_instruction: System role
             temperature: Lower temperature for structured data (default 0.0)
+            ensure_json_hint: Append a "return JSON" instruction to the prompt and system role.
+                Callers whose prompts already ask for JSON pass False.
 
         Returns:
             Parsed JSON dictionary
@@ -86,49 +162,109 @@ class DeepSeekClient:
         config = {"temperature": temperature}
         
         try:
-            # Force JSON structure in prompt if not present
-            if "JSON" not in prompt:
+            if ensure_json_hint:
                 prompt += "\n\nReturn the result as a valid JSON object."
-            if "JSON" not in system_instruction:
                 system_instruction += "\nProvide output in JSON format."
 
             response_text = self.generate_content(prompt, system_instruction, config)
-            return self._parse_json_safe(response_text)
+            return parse_json_safe(response_text)
             
         except Exception as e:
             print(f"❌ Failed to generate/parse JSON: {e}")
             raise
 
-    def _parse_json_safe(self, text: str) -> Dict[str, Any]:
+class AsyncDeepSeekClient:
+    """
+    Asyncio counterpart of DeepSeekClient, built on AsyncOpenAI.
+
+    Independent calls can be awaited together with asyncio.gather, so their network
+    waits overlap instead of running back to back.
+    """
+
+    def __init__(self, api_key: str, model_name: str = "deepseek-chat"):
+        """
+        Initialize the async DeepSeek client.
+
+        Args:
+            api_key: DeepSeek API Key
+            model_name: Model version to use (default: deepseek-chat)
+        """
+        if not api_key:
+            raise ValueError("API key is required for AsyncDeepSeekClient")
+
+        _load_openai()
+        # AsyncOpenAI's own connection pool is bound to the event loop it first runs on,
+        # so each async client keeps its own instead of sharing the sync httpx client
+        self.client = AsyncOpenAI(api_key=api_key, base_url=DEEPSEEK_BASE_URL)
+        self.model_name = model_name
+
+    async def generate_content(self, prompt: str, system_instruction: str = "", config: Optional[Dict[str, Any]] = None) -> str:
         """
-        Safely parse JSON string, handling Markdown fences and common errors.
+        Generate text content from DeepSeek with retry logic.
 
         Args:
-            text: Raw string from LLM
+            prompt: The input prompt string
+            system_instruction: System prompt/role definition
+            config: Optional generation config (temperature, etc.)
 
         Returns:
-            Parsed dictionary
+            Generated text string
         """
-        try:
-            cleaned = text.strip()
-            # Remove markdown code fences
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[7:]
-            elif cleaned.startswith("```"):
-                cleaned = cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            
-            return json.loads(cleaned.strip())
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON Decode Error: {e}")
-            print(f"Raw text start: {text[:100]}")
-            # Try to extract JSON from text if it's embedded
+        temperature = config.get("temperature", 0.7) if config else 0.7
+
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        messages.append({"role": "user", "content": prompt})
+
+        for attempt in range(MAX_ATTEMPTS):
             try:
-                start = text.find('{')
-                end = text.rfind('}') + 1
-                if start != -1 and end != -1:
-                    return json.loads(text[start:end])
-            except:
-                pass
-            raise ValueError(f"Invalid JSON response: {e}")
+                print(f"🤖 User: Calling DeepSeek ({self.model_name}) [async]...")
+                stream = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    stream=True
+                )
+                parts = []
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                return "".join(parts)
+
+            except (RateLimitError, APIError) as e:
+                if isinstance(e, RateLimitError):
+                    print("⚠️  Rate limit exceeded. Retrying...")
+                else:
+                    print(f"❌ DeepSeek API Error: {e}")
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(_retry_delay(attempt))
+            except Exception as e:
+                print(f"❌ DeepSeek API Error: {e}")
+                raise
+
+    async def generate_json(self, prompt: str, system_instruction: str = "", temperature: float = 0.0, ensure_json_hint: bool = True) -> Dict[str, Any]:
+        """
+        Generate and parse JSON content.
+
+        Args:
+            prompt: Input prompt requesting JSON
+            system_instruction: System role
+            temperature: Lower temperature for structured data (default 0.0)
+            ensure_json_hint: Append a "return JSON" instruction to the prompt and system role
+
+        Returns:
+            Parsed JSON dictionary
+        """
+        try:
+            if ensure_json_hint:
+                prompt += "\n\nReturn the result as a valid JSON object."
+                system_instruction += "\nProvide output in JSON format."
+
+            response_text = await self.generate_content(prompt, system_instruction, {"temperature": temperature})
+            return parse_json_safe(response_text)
+
+        except Exception as e:
+            print(f"❌ Failed to generate/parse JSON: {e}")
+            raise
@@ -3,31 +3,97 @@ Document Builder Utility
 Role: Generate professional, ATS-friendly DOCX files.
 """
 
+import io
+import os
+import copy
+import zipfile
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, List
-from docx import Document
-from docx.shared import Pt, Inches, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+# python-docx is imported on first builder construction, not when this module is imported
+Document = Pt = Inches = RGBColor = WD_ALIGN_PARAGRAPH = OxmlElement = qn = None
+CONTENT_TYPES_URI = PACKAGE_URI = _ContentTypesItem = None
+
+def _load_docx():
+    """Import python-docx into this module's namespace."""
+    global Document, Pt, Inches, RGBColor, WD_ALIGN_PARAGRAPH, OxmlElement, qn
+    global CONTENT_TYPES_URI, PACKAGE_URI, _ContentTypesItem
+    if Document is None:
+        from docx import Document
+        from docx.shared import Pt, Inches, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+        from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+        from docx.opc.pkgwriter import _ContentTypesItem
+
+if os.getenv("AI_AGENT_EAGER_IMPORT") == "1":
+    _load_docx()
 
 class DocumentBuilder:
     """
     Handles creation and formatting of MS Word documents.
     """
 
+    # Serialized, already-styled blank document shared by all builders in the process
+    _TEMPLATE_BYTES = None
+
+    # Finished header <w:p> elements keyed by the rendered name and contact line, so the CV
+    # and cover letter of one candidate build the header once
+    _HEADER_CACHE_SIZE = 64
+    _header_cache = OrderedDict()
+    _header_lock = threading.Lock()
+
     def __init__(self):
-        self.doc = Document()
-        self._setup_styles()
+        _load_docx()
+        self.doc = self._new_document()
 
-    def _setup_styles(self):
+    @classmethod
+    def _new_document(cls):
+        """Return a fresh styled document, loaded from the cached template."""
+        if cls._TEMPLATE_BYTES is None:
+            template = Document()
+            cls._setup_styles(template)
+            buffer = io.BytesIO()
+            template.save(buffer)
+            cls._TEMPLATE_BYTES = buffer.getvalue()
+        return Document(io.BytesIO(cls._TEMPLATE_BYTES))
+
+    def _save(self, output_path: str):
+        """
+        Write the document's OPC package straight into a zip file.
+
+        Same parts as Document.save(), but deflated at level 1: compression dominates
+        save time for these small text-only files and level 1 is roughly twice as fast.
+        Uses python-docx internals, so requirements.txt pins the tested release and
+        test_system.py checks that the output reopens with the same text.
+        """
+        package = self.doc.part.package
+        parts = list(package.parts)
+        for part in parts:
+            part.before_marshal()
+
+        with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            zf.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+            zf.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+            for part in parts:
+                zf.writestr(part.partname.membername, part.blob)
+                if len(part.rels):
+                    zf.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+    @staticmethod
+    def _setup_styles(doc):
         """Configure document styles for ATS readability"""
         # Set margins (standard 1 inch)
-        for section in self.doc.sections:
+        for section in doc.sections:
             section.top_margin = Inches(1.0)
             section.bottom_margin = Inches(1.0)
             section.left_margin = Inches(1.0)
             section.right_margin = Inches(1.0)
 
         # Standard font
-        style = self.doc.styles['Normal']
+        style = doc.styles['Normal']
         font = style.font
         font.name = 'Calibri'
         font.size = Pt(11)
@@ -67,7 +133,7 @@ class DocumentBuilder:
                     self._add_education_item(edu)
             
             # Save
-            self.doc.save(output_path)
+            self._save(output_path)
             print(f"✅ Document saved to: {output_path}")
 
         except Exception as e:
@@ -77,13 +143,6 @@ class DocumentBuilder:
     def _add_header(self, info: Dict[str, str]):
         """Add personal info header"""
         name = info.get('name', 'Candidate Name')
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        run = p.add_run(name)
-        run.bold = True
-        run.font.size = Pt(20)
-        run.font.color.rgb = RGBColor(0, 0, 0) # Black
 
         # Contact line
         contact_parts = []
@@ -91,11 +150,46 @@ class DocumentBuilder:
         if info.get('phone'): contact_parts.append(info['phone'])
         if info.get('linkedin'): contact_parts.append(info['linkedin'])
         if info.get('location'): contact_parts.append(info['location'])
+
+        # Keyed on what is actually rendered, so equivalent inputs share one entry
+        key = (name, tuple(contact_parts))
+        with self._header_lock:
+            cached = self._header_cache.get(key)
+            if cached is not None:
+                self._header_cache.move_to_end(key)
+        if cached is not None:
+            for element in cached:
+                self._append_body_element(copy.deepcopy(element))
+            return
+
+        p = self.doc.add_paragraph()
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        built = [p._p]
         
+        run = p.add_run(name)
+        run.bold = True
+        run.font.size = Pt(20)
+        run.font.color.rgb = RGBColor(0, 0, 0) # Black
+
         if contact_parts:
             p = self.doc.add_paragraph(" | ".join(contact_parts))
             p.alignment = WD_ALIGN_PARAGRAPH.CENTER
             p.runs[0].font.size = Pt(10)
+            built.append(p._p)
+
+        with self._header_lock:
+            self._header_cache[key] = [copy.deepcopy(element) for element in built]
+            if len(self._header_cache) > self._HEADER_CACHE_SIZE:
+                self._header_cache.popitem(last=False)
+
+    def _append_body_element(self, element):
+        """Append a block element to the body, ahead of the trailing section properties."""
+        body = self.doc.element.body
+        sect_pr = body.find(qn('w:sectPr'))
+        if sect_pr is not None:
+            sect_pr.addprevious(element)
+        else:
+            body.append(element)
 
     def _add_section_title(self, title: str):
         """Add a standardized section header"""
@@ -173,6 +267,28 @@ class DocumentBuilder:
         if dates:
             p.add_run(f" ({dates})")
 
+    def _add_plain_paragraphs(self, texts: List[str], space_after):
+        """
+        Append unstyled text paragraphs in one pass, building the <w:p> elements directly
+        instead of going through add_paragraph() for each line.
+        """
+        # Shared <w:pPr><w:spacing w:after=.../></w:pPr>, cloned per paragraph
+        ppr = OxmlElement('w:pPr')
+        spacing = OxmlElement('w:spacing')
+        spacing.set(qn('w:after'), str(space_after.twips))
+        ppr.append(spacing)
+
+        for text in texts:
+            p = OxmlElement('w:p')
+            p.append(copy.deepcopy(ppr))
+            run = OxmlElement('w:r')
+            t = OxmlElement('w:t')
+            t.set(qn('xml:space'), 'preserve')
+            t.text = text
+            run.append(t)
+            p.append(run)
+            self._append_body_element(p)
+
     def create_cover_letter(self, letter_body: str, profile: Dict[str, Any], output_path: str):
         """
         Generate a Cover Letter document.
@@ -184,8 +300,7 @@ class DocumentBuilder:
         """
         try:
             # Re-initialize doc for new file
-            self.doc = Document()
-            self._setup_styles()
+            self.doc = self._new_document()
             
             # 1. Header (Same as CV)
             self._add_header(profile.get('personal_info', {}))
@@ -195,13 +310,11 @@ class DocumentBuilder:
             
             # 3. Body
             # Split by newlines to create proper paragraphs
-            for paragraph in letter_body.split('\n'):
-                if paragraph.strip():
-                    p = self.doc.add_paragraph(paragraph.strip())
-                    p.paragraph_format.space_after = Pt(12)
+            paragraphs = [line.strip() for line in letter_body.split('\n') if line.strip()]
+            self._add_plain_paragraphs(paragraphs, space_after=Pt(12))
             
             # Save
-            self.doc.save(output_path)
+            self._save(output_path)
             print(f"✅ Cover Letter saved to: {output_path}")
             
         except Exception as e:
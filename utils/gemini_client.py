@@ -4,10 +4,30 @@ Role: Handle all interactions with Google Gemini API with robust error handling
 """
 
 from typing import Dict, Any, Optional
-import json
-import google.generativeai as genai
-from google.api_core import exceptions as google_exceptions
-from tenacity import retry, stop_after_attempt, wait_exponential
+import os
+import time
+from utils.json_loader import parse_json_safe
+
+# google.generativeai pulls in gRPC/protobuf, so it is imported on first client construction
+genai = None
+google_exceptions = None
+
+def _load_genai():
+    """Import the Gemini SDK into this module's namespace."""
+    global genai, google_exceptions
+    if genai is None:
+        import google.generativeai as genai
+        from google.api_core import exceptions as google_exceptions
+
+if os.getenv("AI_AGENT_EAGER_IMPORT") == "1":
+    try:
+        _load_genai()
+    except ImportError:
+        # Optional dependency (not in requirements.txt); fail at client construction instead
+        pass
+
+# Retry policy: 3 attempts, waiting 2s then 4s (capped at 10s)
+MAX_ATTEMPTS = 3
 
 class GeminiClient:
     """
@@ -25,14 +45,11 @@ class GeminiClient:
         if not api_key:
             raise ValueError("API key is required for GeminiClient")
             
+        _load_genai()
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
         self.model_name = model_name
 
-    @retry(
-        stop=stop_after_attempt(3), 
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
     def generate_content(self, prompt: str, config: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate text content from Gemini with retry logic.
@@ -48,30 +65,37 @@ class GeminiClient:
             google_exceptions.ResourceExhausted: If rate limit exceeded
             ValueError: If generation fails
         """
-        try:
-            print(f"🤖 User: Calling Gemini ({self.model_name})...")
-            generation_config = config or {"temperature": 0.7}
-            
-            response = self.model.generate_content(
-                prompt, 
-                generation_config=generation_config
-            )
-            return response.text
-            
-        except google_exceptions.ResourceExhausted:
-            print("⚠️  Rate limit exceeded. Retrying...")
-            raise
-        except Exception as e:
-            print(f"❌ Gemini API Error: {e}")
-            raise
+        generation_config = config or {"temperature": 0.7}
+
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                print(f"🤖 User: Calling Gemini ({self.model_name})...")
 
-    def generate_json(self, prompt: str, temperature: float = 0.0) -> Dict[str, Any]:
+                # Stream the response and join the chunks once complete
+                response = self.model.generate_content(
+                    prompt, 
+                    generation_config=generation_config,
+                    stream=True
+                )
+                return "".join(chunk.text for chunk in response)
+
+            except Exception as e:
+                if isinstance(e, google_exceptions.ResourceExhausted):
+                    print("⚠️  Rate limit exceeded. Retrying...")
+                else:
+                    print(f"❌ Gemini API Error: {e}")
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                time.sleep(min(10, 2 ** (attempt + 1)))
+
+    def generate_json(self, prompt: str, temperature: float = 0.0, ensure_json_hint: bool = True) -> Dict[str, Any]:
         """
         Generate and parse JSON content.
 
         Args:
             prompt: Input prompt requesting JSON
             temperature: Lower temperature for structured data (default 0.0)
+            ensure_json_hint: Append a "return JSON" instruction; pass False if the prompt already asks for JSON
 
         Returns:
             Parsed JSON dictionary
@@ -79,39 +103,12 @@ class GeminiClient:
         config = {"temperature": temperature, "response_mime_type": "application/json"}
         
         try:
-            # Force JSON structure in prompt if not present
-            if "JSON" not in prompt:
+            if ensure_json_hint:
                 prompt += "\n\nReturn the result as a valid JSON object."
 
             response_text = self.generate_content(prompt, config)
-            return self._parse_json_safe(response_text)
+            return parse_json_safe(response_text)
             
         except Exception as e:
             print(f"❌ Failed to generate/parse JSON: {e}")
             raise
-
-    def _parse_json_safe(self, text: str) -> Dict[str, Any]:
-        """
-        Safely parse JSON string, handling Markdown fences and common errors.
-
-        Args:
-            text: Raw string from LLM
-
-        Returns:
-            Parsed dictionary
-        """
-        try:
-            cleaned = text.strip()
-            # Remove markdown code fences
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[7:]
-            elif cleaned.startswith("```"):
-                cleaned = cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            
-            return json.loads(cleaned.strip())
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON Decode Error: {e}")
-            print(f"Raw text start: {text[:100]}")
-            raise ValueError(f"Invalid JSON response: {e}")
@@ -0,0 +1,78 @@
+"""
+JSON Loader
+Role: Shared JSON parsing helpers for profile files and LLM responses.
+"""
+
+import os
+import re
+import json
+from functools import lru_cache
+from typing import Any
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# Opening ``` / ```json fence with an optional closing fence, on already-stripped text
+_FENCE_RE = re.compile(r'^```(?:json)?(.*?)(?:```)?$', re.DOTALL)
+
+@lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int) -> Any:
+    """Read and parse a file; mtime_ns is part of the cache key so edits invalidate it."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return _loads(raw)
+
+def load_json_file(path: str) -> Any:
+    """
+    Load a JSON file, reusing the parsed result until the file's mtime changes.
+
+    The returned object is shared between callers and must be treated as read-only.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        The parsed JSON value
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
+
+def parse_json_safe(text: str) -> Any:
+    """
+    Safely parse an LLM response as JSON, handling Markdown fences and surrounding prose.
+
+    Args:
+        text: Raw string from LLM
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        ValueError: If no valid JSON could be recovered
+    """
+    cleaned = text.strip()
+    fenced = _FENCE_RE.match(cleaned)
+    if fenced:
+        cleaned = fenced.group(1).strip()
+
+    try:
+        return _loads(cleaned)
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON Decode Error: {e}")
+        print(f"Raw text start: {text[:100]}")
+        # Try to extract JSON from text if it's embedded
+        start = text.find('{')
+        end = text.rfind('}') + 1
+        if start != -1 and end > start:
+            try:
+                return _loads(text[start:end])
+            except json.JSONDecodeError:
+                pass
+        raise ValueError(f"Invalid JSON response: {e}")
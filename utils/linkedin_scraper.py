@@ -9,48 +9,64 @@ import json
 import re
 from typing import Dict, Any, Optional
 
-class LinkedInScraper:
+# Token budget for the pasted profile. The estimator below rounds every word up to a whole
+# token (~2.7 characters per token on English text), so this keeps ~16k characters,
+# comfortably more than the previous 8000-character cap
+MAX_PROFILE_TOKENS = 6000
+# Words/number runs and individual punctuation marks: a cheap stand-in for BPE pieces
+_TOKEN_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+def truncate_to_token_budget(text: str, max_tokens: int = MAX_PROFILE_TOKENS) -> str:
     """
-    Scrapes LinkedIn profile data.
-    Uses AI to parse the raw HTML/text content into structured data.
+    Cut text to an estimated LLM token budget, ending on a whole word.
+
+    Tokens are estimated as one per punctuation mark and one per 4 characters of a word,
+    which tracks BPE tokenizers closely enough for budgeting.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum estimated tokens to keep
+
+    Returns:
+        The longest prefix of text within the budget
     """
-    
-    def __init__(self, llm_client=None):
-        """Initialize with optional LLM client for smart parsing"""
-        self.llm_client = llm_client
-    
-    def parse_profile_text(self, profile_text: str) -> Dict[str, Any]:
-        """
-        Parse raw LinkedIn profile text/content into structured format.
-        Uses LLM for intelligent extraction.
-        """
-        if not self.llm_client:
-            raise ValueError("LLM client required for parsing")
-        
-        prompt = f"""
+    # Every piece costs at least one token and covers at most ~4 characters per token,
+    # so anything this short is always within budget
+    if len(text) <= max_tokens:
+        return text
+
+    used = 0
+    for piece in _TOKEN_PIECE_RE.finditer(text):
+        used += (piece.end() - piece.start() + 3) // 4
+        if used > max_tokens:
+            return text[:piece.start()].rstrip()
+    return text
+
+# Static extraction prompt; the profile text is spliced in at __CONTENT__
+_PROMPT_TMPL = """
         Parse this LinkedIn profile content and extract structured information.
         
         LINKEDIN PROFILE CONTENT:
-        {profile_text[:8000]}  # Limit to avoid token overflow
+        __CONTENT__
         
         OUTPUT FORMAT (JSON):
-        {{
-            "personal_info": {{
+        {
+            "personal_info": {
                 "name": "Full Name",
                 "email": "email if visible or null",
                 "phone": "phone if visible or null", 
                 "linkedin": "LinkedIn URL",
                 "location": "City, Country",
                 "headline": "Professional headline"
-            }},
+            },
             "summary": "Professional summary/about section (2-3 sentences)",
-            "skills": {{
+            "skills": {
                 "Technical": ["Skill 1", "Skill 2"],
                 "Soft Skills": ["Skill 1", "Skill 2"],
                 "Tools": ["Tool 1", "Tool 2"]
-            }},
+            },
             "experience": [
-                {{
+                {
                     "company": "Company Name",
                     "title": "Job Title",
                     "dates": "Start - End",
@@ -59,18 +75,18 @@ class LinkedInScraper:
                         "Achievement 1",
                         "Achievement 2"
                     ]
-                }}
+                }
             ],
             "education": [
-                {{
+                {
                     "school": "University Name",
                     "degree": "Degree Type",
                     "field": "Field of Study",
                     "dates": "Start - End"
-                }}
+                }
             ],
             "certifications": ["Cert 1", "Cert 2"]
-        }}
+        }
         
         RULES:
         1. Extract ALL work experience entries
@@ -79,8 +95,31 @@ class LinkedInScraper:
         4. If data is not available, use null or empty array
         5. Return ONLY valid JSON
         """
+
+class LinkedInScraper:
+    """
+    Scrapes LinkedIn profile data.
+    Uses AI to parse the raw HTML/text content into structured data.
+    """
+    
+    def __init__(self, llm_client=None):
+        """Initialize with optional LLM client for smart parsing"""
+        self.llm_client = llm_client
+    
+    def parse_profile_text(self, profile_text: str) -> Dict[str, Any]:
+        """
+        Parse raw LinkedIn profile text/content into structured format.
+        Uses LLM for intelligent extraction.
+        """
+        if not self.llm_client:
+            raise ValueError("LLM client required for parsing")
+        
+        # Limit to avoid token overflow
+        profile_text = truncate_to_token_budget(profile_text)
+
+        prompt = _PROMPT_TMPL.replace("__CONTENT__", profile_text)
         
-        return self.llm_client.generate_json(prompt, temperature=0.2)
+        return self.llm_client.generate_json(prompt, temperature=0.2, ensure_json_hint=False)
     
     def create_master_profile(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         """
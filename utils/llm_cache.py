@@ -0,0 +1,172 @@
+"""
+LLM Response Cache
+Role: Persistent, content-addressed cache for LLM responses shared by every pipeline.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+GB = 1024 ** 3
+DEFAULT_CACHE_DIR = "data/llm_cache"
+
+def make_key(model: str, prompt: str, temperature: float, max_tokens: Optional[int] = None, system_instruction: str = "") -> str:
+    """
+    Build the cache key for one LLM request.
+
+    Returns:
+        SHA-256 hex digest of model|system_instruction|prompt|temperature|max_tokens
+    """
+    raw = f"{model}|{system_instruction}|{prompt}|{float(temperature)}|{max_tokens}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """
+    Directory-backed key/value store holding one JSON file per cached response.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, size_limit: int = 2 * GB):
+        """
+        Initialize the store.
+
+        Args:
+            cache_dir: Directory holding the cached responses
+            size_limit: Approximate maximum size of the cache directory in bytes
+        """
+        self.cache_dir = cache_dir
+        self.size_limit = size_limit
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Corrupt entry: drop it so the next put() can replace it
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def put(self, key: str, value: Any):
+        """Store a JSON-serializable value under key."""
+        # Write-then-rename so concurrent readers never see a partial file
+        path = self._path(key)
+        # Thread idents repeat across forked workers, so the pid is part of the name too
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._writes += 1
+            check_size = self._writes % 100 == 0
+        if check_size:
+            self._evict()
+
+    def _evict(self):
+        """Delete least-recently-written entries until the cache fits in size_limit."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.size_limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+_default_cache: Optional[LLMCache] = None
+_default_lock = threading.Lock()
+
+def default_cache() -> LLMCache:
+    """Process-wide cache instance (created on first use)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
+
+def get(key: str) -> Optional[Any]:
+    """Look up key in the process-wide cache."""
+    return default_cache().get(key)
+
+def put(key: str, value: Any):
+    """Store value under key in the process-wide cache."""
+    default_cache().put(key, value)
+
+class CachingLLMClient:
+    """
+    Wrapper around an LLM client that checks the response cache before any HTTP call
+    and writes successful responses back.
+
+    Identical requests (retries, repeated job descriptions) skip both prefill and decode
+    entirely. Only deterministic (temperature 0) calls are cached: sampled calls such as CV
+    tailoring and cover letters must produce a fresh draft each time, so they always go
+    through to the client. Pass bypass_cache=True to force a fresh generation.
+    """
+
+    def __init__(self, client: Any, cache: Optional[LLMCache] = None):
+        """
+        Initialize the wrapper.
+
+        Args:
+            client: Underlying client exposing generate_json/generate_content
+            cache: Store to use (default: the process-wide cache)
+        """
+        self.client = client
+        self.model_name = getattr(client, "model_name", "")
+        self.cache = cache or default_cache()
+
+    def generate_content(self, prompt: str, system_instruction: str = "", config: Optional[Dict[str, Any]] = None, bypass_cache: bool = False) -> str:
+        """Cached generate_content."""
+        temperature = config.get("temperature", 0.7) if config else 0.7
+        max_tokens = config.get("max_tokens") if config else None
+        if temperature != 0:
+            return self.client.generate_content(prompt, system_instruction=system_instruction, config=config)
+        key = make_key(self.model_name, prompt, temperature, max_tokens, system_instruction)
+
+        if not bypass_cache:
+            cached = self.cache.get(key)
+            if isinstance(cached, str):
+                print("⚡ LLM cache hit")
+                return cached
+
+        result = self.client.generate_content(prompt, system_instruction=system_instruction, config=config)
+        self.cache.put(key, result)
+        return result
+
+    def generate_json(self, prompt: str, system_instruction: str = "", temperature: float = 0.0, bypass_cache: bool = False, ensure_json_hint: bool = True, **kwargs) -> Dict[str, Any]:
+        """Cached generate_json (stored under a separate key namespace from raw text)."""
+        if temperature != 0:
+            return self.client.generate_json(prompt, system_instruction=system_instruction, temperature=temperature, ensure_json_hint=ensure_json_hint, **kwargs)
+        # The hint changes the prompt actually sent, so it is part of the key
+        key = make_key(f"{self.model_name}:json:{int(ensure_json_hint)}", prompt, temperature, None, system_instruction)
+
+        if not bypass_cache:
+            cached = self.cache.get(key)
+            if isinstance(cached, dict):
+                print("⚡ LLM cache hit")
+                return cached
+
+        result = self.client.generate_json(prompt, system_instruction=system_instruction, temperature=temperature, ensure_json_hint=ensure_json_hint, **kwargs)
+        self.cache.put(key, result)
+        return result
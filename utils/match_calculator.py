@@ -3,22 +3,42 @@ Match Score Calculator Utility
 Role: Calculate how well a candidate profile matches a job description.
 """
 
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Tuple, Hashable, Optional, Sequence, TextIO, Callable
+from collections import OrderedDict
+from bisect import bisect_left
+import sys
+import threading
+import copy
 import re
 
+# Capitalized word runs in experience bullets ("Machine Learning", "Kubernetes")
+_CAP_WORDS = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
 class MatchCalculator:
     """
     Calculates match scores between candidate profiles and job requirements.
     """
     
-    def __init__(self):
-        """Initialize the match calculator."""
-        pass
-    
+    def __init__(self, cache_size: int = 256, score_cache_size: int = 1024):
+        """
+        Initialize the match calculator.
+
+        Args:
+            cache_size: Number of preprocessed profiles to keep (see calculate_match_score's cache_key)
+            score_cache_size: Number of (cache_key, job_key) results to keep; 0 disables result caching
+        """
+        self.cache_size = cache_size
+        self.score_cache_size = score_cache_size
+        self._features_cache: "OrderedDict[Hashable, Dict[str, frozenset]]" = OrderedDict()
+        self._score_cache: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def calculate_match_score(
         self, 
         profile: Dict[str, Any], 
-        job_analysis: Dict[str, Any]
+        job_analysis: Dict[str, Any],
+        cache_key: Optional[Hashable] = None,
+        job_key: Optional[Hashable] = None
     ) -> Dict[str, Any]:
         """
         Calculate comprehensive match score between profile and job.
@@ -26,11 +46,74 @@ class MatchCalculator:
         Args:
             profile: Candidate's master profile
             job_analysis: Analyzed job requirements
+            cache_key: (Optional) Identifies this version of the profile, e.g. (user_id, updated_at).
+                The profile-side tokenization is computed once per key.
+            job_key: (Optional) Identifies the job analysis, e.g. the analyzer's description_hash.
+                When both keys are given, the full result is memoized per (cache_key, job_key).
             
         Returns:
             Dictionary with match scores and detailed breakdown
         """
-        # Extract data
+        # Keys come from the caller: hashing the profile and analysis here would cost about as much as scoring
+        score_key = None
+        if cache_key is not None and job_key is not None and self.score_cache_size > 0:
+            score_key = (cache_key, job_key)
+            with self._cache_lock:
+                cached = self._score_cache.get(score_key)
+                if cached is not None:
+                    self._score_cache.move_to_end(score_key)
+            if cached is not None:
+                # Callers may modify the returned dict/lists, so hand out copies
+                return copy.deepcopy(cached)
+
+        # Extract candidate skills (per profile version, not per job)
+        features = self._get_profile_features(profile, cache_key)
+        result = self._compile_items(self._job_items(job_analysis))(features)
+
+        if score_key is not None:
+            with self._cache_lock:
+                self._score_cache[score_key] = copy.deepcopy(result)
+                if len(self._score_cache) > self.score_cache_size:
+                    self._score_cache.popitem(last=False)
+        return result
+
+    def calculate_match_scores_batch(
+        self,
+        profile: Dict[str, Any],
+        job_analyses: List[Dict[str, Any]],
+        cache_key: Optional[Hashable] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score one profile against many jobs.
+
+        The profile is tokenized once, and each distinct skill/keyword across the batch is
+        matched against it once. Those results are kept as bits of one int, so a job's match
+        count is a single AND + popcount of its own item mask.
+
+        Args:
+            profile: Candidate's master profile
+            job_analyses: Analyzed job requirements, one per job
+            cache_key: (Optional) Profile version key, as in calculate_match_score
+
+        Returns:
+            One match score dictionary per job, in input order
+        """
+        features = self._get_profile_features(profile, cache_key)
+        jobs = [self._job_items(job_analysis) for job_analysis in job_analyses]
+
+        skill_mask = self._build_match_mask(
+            {item for required, nice, _ in jobs for item in required | nice},
+            features['skills'], features['skill_words'], features['skill_keys']
+        )
+        keyword_mask = self._build_match_mask(
+            {item for _, _, keywords in jobs for item in keywords},
+            features['keywords'], features['keyword_words'], features['keyword_keys']
+        )
+        return [self._compile_items(items)(features, skill_mask, keyword_mask) for items in jobs]
+
+    @staticmethod
+    def _job_items(job_analysis: Dict[str, Any]) -> Tuple[Set[str], Set[str], Set[str]]:
+        """Lowercased (must-have skills, nice-to-have skills, ATS keywords) of one job."""
         required_skills = set(
             skill.lower() 
             for skill in job_analysis.get('requirements', {}).get('must_have_skills', [])
@@ -43,60 +126,135 @@ class MatchCalculator:
             keyword.lower() 
             for keyword in job_analysis.get('keywords', {}).get('ats_keywords', [])
         )
-        
-        # Extract candidate skills
-        candidate_skills = self._extract_candidate_skills(profile)
-        candidate_keywords = self._extract_keywords_from_profile(profile)
-        
-        # Calculate matches
-        required_matches = self._count_matches(required_skills, candidate_skills)
-        nice_to_have_matches = self._count_matches(nice_to_have_skills, candidate_skills)
-        keyword_matches = self._count_matches(ats_keywords, candidate_keywords)
-        
-        # Calculate scores
-        required_score = (
-            (required_matches / len(required_skills) * 100) 
-            if required_skills else 100
-        )
-        nice_to_have_score = (
-            (nice_to_have_matches / len(nice_to_have_skills) * 50) 
-            if nice_to_have_skills else 0
-        )
-        keyword_score = (
-            (keyword_matches / len(ats_keywords) * 30) 
-            if ats_keywords else 0
-        )
-        
-        # Overall score (weighted)
-        overall_score = min(100, required_score + nice_to_have_score + keyword_score)
-        
-        # Missing skills
-        missing_required = required_skills - candidate_skills
-        missing_nice_to_have = nice_to_have_skills - candidate_skills
-        
-        return {
-            'overall_score': round(overall_score, 1),
-            'required_skills_score': round(required_score, 1),
-            'nice_to_have_score': round(nice_to_have_score, 1),
-            'keyword_score': round(keyword_score, 1),
-            'required_skills_matched': required_matches,
-            'required_skills_total': len(required_skills),
-            'nice_to_have_matched': nice_to_have_matches,
-            'nice_to_have_total': len(nice_to_have_skills),
-            'keywords_matched': keyword_matches,
-            'keywords_total': len(ats_keywords),
-            'missing_required_skills': list(missing_required)[:10],  # Top 10
-            'missing_nice_to_have_skills': list(missing_nice_to_have)[:10],
-            'recommendations': self._generate_recommendations(
-                overall_score, 
-                missing_required, 
-                missing_nice_to_have
-            )
-        }
+        return required_skills, nice_to_have_skills, ats_keywords
+
+    def compile_job(self, job_analysis: Dict[str, Any]) -> Callable[..., Dict[str, Any]]:
+        """
+        Specialize scoring for one job, for scans that reuse the same jobs across profiles or refreshes.
+
+        Args:
+            job_analysis: Analyzed job requirements
+
+        Returns:
+            scorer(profile, cache_key=None) returning the same dictionary as calculate_match_score
+        """
+        score = self._compile_items(self._job_items(job_analysis))
+
+        def scorer(profile: Dict[str, Any], cache_key: Optional[Hashable] = None) -> Dict[str, Any]:
+            return score(self._get_profile_features(profile, cache_key))
+
+        return scorer
+
+    def _compile_items(self, items: Tuple[Set[str], Set[str], Set[str]]) -> Callable[..., Dict[str, Any]]:
+        """
+        Precompute the job-only parts of scoring (frozen item sets and their totals).
+
+        Returns:
+            score(features, skill_mask=None, keyword_mask=None) for preprocessed profile features
+        """
+        required_skills, nice_to_have_skills, ats_keywords = (frozenset(group) for group in items)
+        required_total = len(required_skills)
+        nice_to_have_total = len(nice_to_have_skills)
+        keywords_total = len(ats_keywords)
+
+        def score(
+            features: Dict[str, Any],
+            skill_mask: Optional[Tuple[Dict[str, int], int]] = None,
+            keyword_mask: Optional[Tuple[Dict[str, int], int]] = None
+        ) -> Dict[str, Any]:
+            candidate_skills = features['skills']
+            
+            # Calculate matches
+            if skill_mask is not None:
+                required_matches = self._count_masked(required_skills, *skill_mask)
+                nice_to_have_matches = self._count_masked(nice_to_have_skills, *skill_mask)
+            else:
+                required_matches = self._count_matches(required_skills, candidate_skills, features['skill_words'], features['skill_keys'])
+                nice_to_have_matches = self._count_matches(nice_to_have_skills, candidate_skills, features['skill_words'], features['skill_keys'])
+            if keyword_mask is not None:
+                keyword_matches = self._count_masked(ats_keywords, *keyword_mask)
+            else:
+                keyword_matches = self._count_matches(ats_keywords, features['keywords'], features['keyword_words'], features['keyword_keys'])
+            
+            # Calculate scores
+            # (matches / total * points, kept in this order so results round exactly as before)
+            required_score = required_matches / required_total * 100 if required_total else 100
+            nice_to_have_score = nice_to_have_matches / nice_to_have_total * 50 if nice_to_have_total else 0
+            keyword_score = keyword_matches / keywords_total * 30 if keywords_total else 0
+            
+            # Overall score (weighted)
+            overall_score = min(100, required_score + nice_to_have_score + keyword_score)
+            
+            # Missing skills
+            missing_required = required_skills - candidate_skills
+            missing_nice_to_have = nice_to_have_skills - candidate_skills
+            
+            return {
+                'overall_score': round(overall_score, 1),
+                'required_skills_score': round(required_score, 1),
+                'nice_to_have_score': round(nice_to_have_score, 1),
+                'keyword_score': round(keyword_score, 1),
+                'required_skills_matched': required_matches,
+                'required_skills_total': required_total,
+                'nice_to_have_matched': nice_to_have_matches,
+                'nice_to_have_total': nice_to_have_total,
+                'keywords_matched': keyword_matches,
+                'keywords_total': keywords_total,
+                'missing_required_skills': list(missing_required)[:10],  # Top 10
+                'missing_nice_to_have_skills': list(missing_nice_to_have)[:10],
+                'recommendations': self._generate_recommendations(
+                    overall_score, 
+                    missing_required, 
+                    missing_nice_to_have
+                )
+            }
+
+        return score
     
-    def _extract_candidate_skills(self, profile: Dict[str, Any]) -> Set[str]:
-        """Extract all skills from candidate profile."""
+    def _get_profile_features(self, profile: Dict[str, Any], cache_key: Optional[Hashable]) -> Dict[str, frozenset]:
+        """Return the profile's skill/keyword sets, memoized under cache_key when one is given."""
+        if cache_key is not None:
+            with self._cache_lock:
+                features = self._features_cache.get(cache_key)
+                if features is not None:
+                    self._features_cache.move_to_end(cache_key)
+                    return features
+
+        skills, keywords = self._extract_profile_features(profile)
+        skills = frozenset(skills)
+        keywords = frozenset(keywords)
+        skill_words = self._split_words(skills)
+        keyword_words = self._split_words(keywords)
+        features = {
+            'skills': skills,
+            'skill_words': skill_words,
+            'skill_keys': tuple(sorted(skills | skill_words)),
+            'keywords': keywords,
+            'keyword_words': keyword_words,
+            'keyword_keys': tuple(sorted(keywords | keyword_words)),
+        }
+
+        if cache_key is not None:
+            with self._cache_lock:
+                self._features_cache[cache_key] = features
+                if len(self._features_cache) > self.cache_size:
+                    self._features_cache.popitem(last=False)
+        return features
+
+    @staticmethod
+    def _split_words(items: Set[str]) -> frozenset:
+        """Union of the whitespace-separated words of every item."""
+        return frozenset(word for item in items for word in item.split())
+
+    def _extract_profile_features(self, profile: Dict[str, Any]) -> Tuple[Set[str], Set[str]]:
+        """
+        Extract the candidate's skills and profile keywords in one pass over the profile.
+
+        Returns:
+            (skills, keywords) sets, all lowercased
+        """
         skills_set = set()
+        keywords = set()
         
         # From skills section
         skills_data = profile.get('skills', {})
@@ -107,51 +265,96 @@ class MatchCalculator:
         elif isinstance(skills_data, list):
             skills_set.update(skill.lower() for skill in skills_data)
         
-        # From experience descriptions
+        # Keywords from summary
+        summary = profile.get('summary', '')
+        keywords.update(word for word in summary.lower().split() if len(word) > 4)
+        
+        # Skills and keywords from experience descriptions
         for exp in profile.get('experience', []):
             responsibilities = exp.get('responsibilities', []) + exp.get('achievements', [])
             for resp in responsibilities:
                 # Extract potential skills (simple keyword extraction)
-                words = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', resp)
+                words = _CAP_WORDS.findall(resp)
                 skills_set.update(word.lower() for word in words if len(word) > 3)
+            
+            # Lowercase the role's text once instead of word by word
+            text = ' '.join(responsibilities).lower()
+            keywords.update(word for word in text.split() if len(word) > 4)
         
-        return skills_set
-    
-    def _extract_keywords_from_profile(self, profile: Dict[str, Any]) -> Set[str]:
-        """Extract keywords from profile text."""
-        keywords = set()
-        
-        # From summary
-        summary = profile.get('summary', '')
-        keywords.update(word.lower() for word in summary.split() if len(word) > 4)
-        
-        # From experience
-        for exp in profile.get('experience', []):
-            text = ' '.join(exp.get('responsibilities', []) + exp.get('achievements', []))
-            keywords.update(word.lower() for word in text.split() if len(word) > 4)
-        
-        return keywords
+        return skills_set, keywords
     
-    def _count_matches(self, required: Set[str], candidate: Set[str]) -> int:
+    # A candidate key may extend a required item by at most this many characters
+    # ("postgres" -> "postgresql", "microservice" -> "microservices", not "java" -> "javascript")
+    MAX_PREFIX_EXTENSION = 2
+
+    @classmethod
+    def _has_extension(cls, sorted_keys: Sequence[str], item: str) -> bool:
+        """True if a key in the sorted sequence is item plus a short suffix (binary search, O(log n))."""
+        i = bisect_left(sorted_keys, item)
+        # Keys starting with item are contiguous from i
+        while i < len(sorted_keys) and sorted_keys[i].startswith(item):
+            if len(sorted_keys[i]) - len(item) <= cls.MAX_PREFIX_EXTENSION:
+                return True
+            i += 1
+        return False
+
+    def _item_matches(self, req_item: str, candidate: Set[str], candidate_words: Set[str], candidate_keys: Sequence[str]) -> bool:
+        """True if one required item matches the candidate side (fuzzy matching)."""
+        return (
+            # Exact match, else partial match (word-level)
+            req_item in candidate
+            or not candidate_words.isdisjoint(req_item.split())
+            # Else the whole item plus a short suffix ("postgres" -> "postgresql")
+            or (len(req_item) >= 4 and self._has_extension(candidate_keys, req_item))
+        )
+
+    def _count_matches(
+        self,
+        required: Set[str],
+        candidate: Set[str],
+        candidate_words: Optional[Set[str]] = None,
+        candidate_keys: Optional[Sequence[str]] = None
+    ) -> int:
         """Count how many required items match candidate items (fuzzy matching)."""
-        matches = 0
+        # Split the candidate side once: a word-level overlap with any candidate item
+        # is the same as an overlap with the union of all candidate words
+        if candidate_words is None:
+            candidate_words = self._split_words(candidate)
+        if candidate_keys is None:
+            candidate_keys = tuple(sorted(candidate | candidate_words))
         
-        for req_item in required:
-            # Exact match
-            if req_item in candidate:
-                matches += 1
-                continue
-            
-            # Partial match (word-level)
-            req_words = set(req_item.split())
-            for cand_item in candidate:
-                cand_words = set(cand_item.split())
-                # If significant overlap
-                if req_words & cand_words:
-                    matches += 1
-                    break
-        
-        return matches
+        return sum(
+            1 for req_item in required
+            if self._item_matches(req_item, candidate, candidate_words, candidate_keys)
+        )
+
+    def _build_match_mask(
+        self,
+        vocabulary: Set[str],
+        candidate: Set[str],
+        candidate_words: Set[str],
+        candidate_keys: Sequence[str]
+    ) -> Tuple[Dict[str, int], int]:
+        """
+        Give each vocabulary item a bit and test it against the candidate once.
+
+        Returns:
+            (item -> bit position, int with the bits of all matching items set)
+        """
+        bits = {item: i for i, item in enumerate(vocabulary)}
+        matched = 0
+        for item, i in bits.items():
+            if self._item_matches(item, candidate, candidate_words, candidate_keys):
+                matched |= 1 << i
+        return bits, matched
+
+    @staticmethod
+    def _count_masked(required: Set[str], bits: Dict[str, int], matched: int) -> int:
+        """Count matching required items with one AND + popcount (see _build_match_mask)."""
+        mask = 0
+        for item in required:
+            mask |= 1 << bits[item]
+        return (mask & matched).bit_count()
     
     def _generate_recommendations(
         self, 
@@ -179,33 +382,38 @@ class MatchCalculator:
         
         return recommendations
     
-    def print_match_report(self, match_data: Dict[str, Any]) -> None:
-        """Print a formatted match score report."""
-        print("\n" + "=" * 60)
-        print("📊 MATCH SCORE ANALYSIS")
-        print("=" * 60)
-        
-        print(f"\n🎯 Overall Match Score: {match_data['overall_score']}/100")
-        
-        print(f"\n📋 Required Skills:")
-        print(f"   Matched: {match_data['required_skills_matched']}/{match_data['required_skills_total']}")
-        print(f"   Score: {match_data['required_skills_score']}/100")
-        
-        print(f"\n⭐ Nice-to-Have Skills:")
-        print(f"   Matched: {match_data['nice_to_have_matched']}/{match_data['nice_to_have_total']}")
-        print(f"   Score: {match_data['nice_to_have_score']}/50")
-        
-        print(f"\n🔑 Keywords:")
-        print(f"   Matched: {match_data['keywords_matched']}/{match_data['keywords_total']}")
-        print(f"   Score: {match_data['keyword_score']}/30")
+    def print_match_report(self, match_data: Dict[str, Any], file: Optional[TextIO] = None) -> None:
+        """
+        Print a formatted match score report.
+
+        Args:
+            match_data: Result of calculate_match_score
+            file: Stream to write to (default: sys.stdout)
+        """
+        lines = [
+            "\n" + "=" * 60,
+            "📊 MATCH SCORE ANALYSIS",
+            "=" * 60,
+            f"\n🎯 Overall Match Score: {match_data['overall_score']}/100",
+            f"\n📋 Required Skills:",
+            f"   Matched: {match_data['required_skills_matched']}/{match_data['required_skills_total']}",
+            f"   Score: {match_data['required_skills_score']}/100",
+            f"\n⭐ Nice-to-Have Skills:",
+            f"   Matched: {match_data['nice_to_have_matched']}/{match_data['nice_to_have_total']}",
+            f"   Score: {match_data['nice_to_have_score']}/50",
+            f"\n🔑 Keywords:",
+            f"   Matched: {match_data['keywords_matched']}/{match_data['keywords_total']}",
+            f"   Score: {match_data['keyword_score']}/30",
+        ]
         
         if match_data['missing_required_skills']:
-            print(f"\n❌ Missing Required Skills:")
-            for skill in match_data['missing_required_skills']:
-                print(f"   • {skill.title()}")
+            lines.append(f"\n❌ Missing Required Skills:")
+            lines.extend(f"   • {skill.title()}" for skill in match_data['missing_required_skills'])
+        
+        lines.append(f"\n💡 Recommendations:")
+        lines.extend(f"   {rec}" for rec in match_data['recommendations'])
         
-        print(f"\n💡 Recommendations:")
-        for rec in match_data['recommendations']:
-            print(f"   {rec}")
+        lines.append("\n" + "=" * 60)
         
-        print("\n" + "=" * 60)
+        # One write for the whole report instead of a print() per line
+        (file or sys.stdout).write("\n".join(lines) + "\n")
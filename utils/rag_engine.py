@@ -3,9 +3,26 @@ RAG Engine (Retrieval-Augmented Generation)
 Role: Store and retrieve relevant "experience snippets" to improve LLM precision and save tokens.
 """
 
-import json
+import os
 import re
-from typing import List, Dict, Any
+import math
+import heapq
+import pickle
+import hashlib
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter
+from utils.json_loader import load_json_file
+
+# Parsed snippet index, reused across process starts while the profile file is unchanged
+RAG_CACHE_DIR = ".cache"
+
+# Words, keeping tech names like "c++", "c#" and "node.js" whole
+_TOKEN_RE = re.compile(r"[\w+#]+(?:\.\w+)*")
+
+# Okapi BM25 parameters (term-frequency saturation, length normalization)
+BM25_K1 = 1.5
+BM25_B = 0.75
 
 class RAGEngine:
     """
@@ -15,14 +32,148 @@ class RAGEngine:
 
     def __init__(self, profile_path: str = "data/master_profile.json"):
         self.profile_path = profile_path
-        self.snippets = []
-        self._initialize_snippets()
+        self._reload_lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """
+        (Re)build the snippets and BM25 index from the current profile file.
+
+        Everything is built into locals and published as one (snippets, vocab, postings)
+        snapshot, so concurrent queries see either the old index or the new one, never a mix.
+        """
+        # Taken before reading, so an edit that lands mid-load still triggers a refresh
+        version = self._profile_version()
+
+        cached = self._load_cached_index(version)
+        if cached is not None:
+            snippets, content_lower = cached
+        else:
+            snippets = self._initialize_snippets()
+            # Lowercased once here rather than for every query
+            content_lower = [snippet['content'].lower() for snippet in snippets]
+            self._save_cached_index(version, snippets, content_lower)
+
+        vocab, postings = self._build_bm25_index(content_lower)
+
+        self._index = (snippets, vocab, postings)
+        self.snippets = snippets
+        self._content_lower = content_lower
+        # Published last: until now, refresh_if_changed keeps seeing the old version
+        self._loaded_version = version
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Reload the index if the profile file changed since it was loaded (one stat call).
+
+        Returns:
+            True if the index was rebuilt
+        """
+        if self._profile_version() == self._loaded_version:
+            return False
+        with self._reload_lock:
+            # Another request may have reloaded while this one waited
+            if self._profile_version() == self._loaded_version:
+                return False
+            print("🔄 RAG: Profile changed on disk, reloading snippets...")
+            self._load()
+            return True
+
+    def _build_bm25_index(self, content_lower: List[str]) -> Tuple[Dict[str, int], List[Tuple[Tuple[int, float], ...]]]:
+        """
+        Build the BM25 inverted index over lowercased snippet contents.
+
+        Tokens are mapped to integer ids, and each posting stores the term's full BM25
+        contribution to that snippet (idf x saturated, length-normalized tf). Both only
+        depend on the snippet set, so a query is just id lookups and additions.
+
+        Returns:
+            (token -> id vocabulary, postings list indexed by token id)
+        """
+        doc_tokens = [_TOKEN_RE.findall(content) for content in content_lower]
+        n_docs = len(doc_tokens)
+        total_tokens = sum(map(len, doc_tokens))
+        # No tokens at all (e.g. only empty or punctuation-only snippets): any non-zero
+        # average works, since there are no postings to weight
+        avg_doc_len = total_tokens / n_docs if total_tokens else 1.0
+
+        vocab: Dict[str, int] = {}
+        raw_postings: List[List[Tuple[int, int]]] = []
+        for i, tokens in enumerate(doc_tokens):
+            for token, tf in Counter(tokens).items():
+                token_id = vocab.setdefault(token, len(raw_postings))
+                if token_id == len(raw_postings):
+                    raw_postings.append([])
+                raw_postings[token_id].append((i, tf))
+
+        # Per-snippet length normalization: k1 * (1 - b + b * len / avg_len)
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / avg_doc_len) for tokens in doc_tokens]
+
+        postings_by_id: List[Tuple[Tuple[int, float], ...]] = []
+        for postings in raw_postings:
+            # Non-negative IDF variant (as in Lucene), so very common terms still count a little
+            idf = math.log((n_docs - len(postings) + 0.5) / (len(postings) + 0.5) + 1)
+            postings_by_id.append(tuple(
+                (i, idf * tf * (BM25_K1 + 1) / (tf + norms[i])) for i, tf in postings
+            ))
+        return vocab, postings_by_id
+
+    def _cache_path(self) -> str:
+        """Pickle file holding this profile's index (one file per profile path)."""
+        digest = hashlib.sha256(os.path.abspath(self.profile_path).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(RAG_CACHE_DIR, f"rag_{digest}.pkl")
+
+    def _profile_version(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the profile file, or None if it can't be read."""
+        try:
+            stat = os.stat(self.profile_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_cached_index(self, version: Optional[Tuple[int, int]]) -> Optional[Tuple[List[Dict[str, Any]], List[str]]]:
+        """
+        Load snippets from the on-disk cache if it matches the given profile file version.
 
-    def _initialize_snippets(self):
+        Returns:
+            (snippets, lowercased contents), or None on a miss
+        """
+        if version is None:
+            return None
+        try:
+            with open(self._cache_path(), "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if cached.get("version") != version:
+            return None
+
+        print(f"📊 RAG: Loaded {len(cached['snippets'])} experience snippets from cache.")
+        return cached["snippets"], cached["content_lower"]
+
+    def _save_cached_index(self, version: Optional[Tuple[int, int]], snippets: List[Dict[str, Any]], content_lower: List[str]):
+        """Write the parsed snippets to the on-disk cache (best effort)."""
+        if version is None or not snippets:
+            return
+        try:
+            os.makedirs(RAG_CACHE_DIR, exist_ok=True)
+            path = self._cache_path()
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({
+                    "version": version,
+                    "snippets": snippets,
+                    "content_lower": content_lower
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ RAG: Could not write snippet cache: {e}")
+
+    def _initialize_snippets(self) -> List[Dict[str, Any]]:
         """Parse the profile into discrete experience snippets."""
+        snippets = []
         try:
-            with open(self.profile_path, 'r', encoding='utf-8') as f:
-                profile = json.load(f)
+            profile = load_json_file(self.profile_path)
             
             # 1. Standardize Experience Snippets
             for role in profile.get('experience', []):
@@ -31,7 +182,7 @@ class RAGEngine:
                 
                 # Create a snippet for each achievement to allow granular retrieval
                 for ach in role.get('achievements', role.get('responsibilities', [])):
-                    self.snippets.append({
+                    snippets.append({
                         "content": ach,
                         "metadata": {
                             "type": "experience",
@@ -43,41 +194,42 @@ class RAGEngine:
             
             # 2. Project Snippets
             for project in profile.get('projects', []):
-                self.snippets.append({
+                snippets.append({
                     "content": f"Project {project.get('name')}: {project.get('description')}",
                     "metadata": {"type": "project", "name": project.get('name')}
                 })
                 
-            print(f"📊 RAG: Initialized with {len(self.snippets)} experience snippets.")
+            print(f"📊 RAG: Initialized with {len(snippets)} experience snippets.")
             
         except Exception as e:
             print(f"⚠️ RAG Initialization failed: {e}")
+        
+        return snippets
 
     def retrieve_relevant_experience(self, job_keywords: List[str], top_k: int = 15) -> List[Dict[str, Any]]:
         """
         Retrieve segments that match high-priority job keywords.
-        Uses a frequency-based scoring (BM25 variant logic) for precision.
+        Scores with Okapi BM25 over an inverted index, so only snippets sharing
+        at least one term with the keywords are ever looked at.
         """
-        scored_snippets = []
+        self.refresh_if_changed()
+        # Read the index once: a concurrent reload swaps in a whole new snapshot
+        snippets, vocab, postings = self._index
         
-        for snippet in self.snippets:
-            score = 0
-            content_lower = snippet['content'].lower()
-            
-            for kw in job_keywords:
-                # Weighted score: exact matches in snippets are high value
-                if re.search(rf'\b{re.escape(kw.lower())}\b', content_lower):
-                    score += 2
-                elif kw.lower() in content_lower:
-                    score += 1
-            
-            if score > 0:
-                scored_snippets.append((score, snippet))
+        query_ids = {
+            vocab[token]
+            for kw in job_keywords
+            for token in _TOKEN_RE.findall(kw.lower())
+            if token in vocab
+        }
         
-        # Sort by score descending
-        scored_snippets.sort(key=lambda x: x[0], reverse=True)
+        scores: Dict[int, float] = {}
+        for token_id in query_ids:
+            for i, weight in postings[token_id]:
+                scores[i] = scores.get(i, 0.0) + weight
         
-        # Return top K
-        results = [s[1] for s in scored_snippets[:top_k]]
+        # Top K by score without sorting every candidate
+        top = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        results = [snippets[i] for i, _ in top]
         print(f"🎯 RAG: Retrieved {len(results)} relevant snippets for customization.")
         return results
@@ -3,56 +3,53 @@ Quick verification script to test if all services are running correctly
 """
 import requests
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def test_api_health():
-    """Test if the FastAPI server is running"""
+# One keep-alive pool for every probe (the API and docs checks hit the same host)
+SESSION = requests.Session()
+
+def _probe(url, online_msg, short_name, offline_msg):
+    """
+    GET url once and describe the outcome.
+
+    Returns:
+        (ok, message) tuple; printing is left to the caller so concurrent probes don't interleave
+    """
     try:
-        response = requests.get('http://localhost:8000/', timeout=5)
+        response = SESSION.get(url, timeout=5)
         if response.status_code == 200:
-            print("✅ API Server (Port 8000): ONLINE")
-            return True
-        else:
-            print(f"⚠️  API Server: Unexpected status {response.status_code}")
-            return False
+            return True, online_msg
+        return False, f"⚠️  {short_name}: Unexpected status {response.status_code}"
     except requests.exceptions.RequestException as e:
-        print(f"❌ API Server (Port 8000): OFFLINE - {e}")
-        return False
+        return False, f"{offline_msg} - {e}"
+
+def test_api_health():
+    """Test if the FastAPI server is running"""
+    return _probe('http://localhost:8000/', "✅ API Server (Port 8000): ONLINE",
+                  "API Server", "❌ API Server (Port 8000): OFFLINE")
 
 def test_web_interface():
     """Test if the web interface is accessible"""
-    try:
-        response = requests.get('http://localhost:3000/', timeout=5)
-        if response.status_code == 200:
-            print("✅ Web Interface (Port 3000): ONLINE")
-            return True
-        else:
-            print(f"⚠️  Web Interface: Unexpected status {response.status_code}")
-            return False
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Web Interface (Port 3000): OFFLINE - {e}")
-        return False
+    return _probe('http://localhost:3000/', "✅ Web Interface (Port 3000): ONLINE",
+                  "Web Interface", "❌ Web Interface (Port 3000): OFFLINE")
 
 def test_api_docs():
     """Test if API documentation is accessible"""
-    try:
-        response = requests.get('http://localhost:8000/docs', timeout=5)
-        if response.status_code == 200:
-            print("✅ API Documentation (/docs): ACCESSIBLE")
-            return True
-        else:
-            print(f"⚠️  API Docs: Unexpected status {response.status_code}")
-            return False
-    except requests.exceptions.RequestException as e:
-        print(f"❌ API Documentation: NOT ACCESSIBLE - {e}")
-        return False
+    return _probe('http://localhost:8000/docs', "✅ API Documentation (/docs): ACCESSIBLE",
+                  "API Docs", "❌ API Documentation: NOT ACCESSIBLE")
 
 if __name__ == "__main__":
     print("🔍 Testing AI Job Application Agent Services...\n")
     
+    # Run the checks concurrently, then report in a fixed order
+    checks = [test_api_health, test_web_interface, test_api_docs]
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        outcomes = list(executor.map(lambda check: check(), checks))
+    
     results = []
-    results.append(test_api_health())
-    results.append(test_web_interface())
-    results.append(test_api_docs())
+    for ok, message in outcomes:
+        print(message)
+        results.append(ok)
     
     print("\n" + "="*50)
     if all(results):